@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import ccxt.async as ccxt  # noqa: E402
+
+
+async def test():
+    exchange = ccxt.binance({
+        'enableRateLimit': True,
+    })
+    since = exchange.parse8601('2018-01-01T00:00:00Z')
+    until = exchange.parse8601('2018-01-08T00:00:00Z')
+    # a week of 1m candles in windows of 500, fetched concurrently within the rate limit
+    result = await exchange.fetch_ohlcv_range('BTC/USDT', '1m', since, until)
+    print('Fetched', len(result['ohlcv']), 'candles')
+    for start, end in result['gaps']:
+        print('No candles from', exchange.iso8601(start), 'to', exchange.iso8601(end))
+    await exchange.close()
+
+
+asyncio.get_event_loop().run_until_complete(test())
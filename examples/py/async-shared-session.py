@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import ccxt.async as ccxt  # noqa: E402
+from ccxt.async.base.session_manager import SessionManager  # noqa: E402
+
+
+async def fetch_ticker(exchange, symbol):
+    # async with closes the session of the exchange, or releases the shared one
+    async with exchange:
+        for i in range(0, 3):
+            ticker = await exchange.fetch_ticker(symbol)
+            print(exchange.id, symbol, ticker['last'])
+
+
+loop = asyncio.get_event_loop()
+
+# one connector for all exchanges: at most 4 connections per host, DNS answers cached for 10 minutes
+manager = SessionManager(loop, limit_per_host=4, ttl_dns_cache=600)
+
+exchanges = [
+    (ccxt.bitfinex({'session_manager': manager, 'enableRateLimit': True}), 'BTC/USD'),
+    (ccxt.kraken({'session_manager': manager, 'enableRateLimit': True}), 'BTC/USD'),
+    (ccxt.binance({'session_manager': manager, 'enableRateLimit': True}), 'BTC/USDT'),
+    # without a session_manager of their own, exchanges with shareSession use the default one of the loop
+    (ccxt.poloniex({'shareSession': True, 'enableRateLimit': True}), 'ETH/BTC'),
+]
+
+loop.run_until_complete(asyncio.gather(*[fetch_ticker(exchange, symbol) for exchange, symbol in exchanges]))
+
+# the connections opened for the first tickers are reused for the next ones
+print(manager.stats)
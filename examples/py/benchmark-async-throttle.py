@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Measures CPU cost and scheduling accuracy of the async throttle() with
+# thousands of calls queued across many exchange-like instances on one loop
+
+import asyncio
+import os
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+# -----------------------------------------------------------------------------
+
+from ccxt.async.base.throttle import throttle  # noqa: E402
+
+# -----------------------------------------------------------------------------
+
+num_instances = int(sys.argv[1]) if len(sys.argv) > 1 else 95
+calls_per_instance = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+rate_limit = 50  # milliseconds between calls on each instance
+
+
+async def worker(bucket, index, first, lateness):
+    await bucket()
+    now = asyncio.get_event_loop().time()
+    # the bucket starts full, calls are then due every rate_limit ms after the first one
+    if index == 0:
+        first[bucket] = now
+    else:
+        lateness.append(now - (first[bucket] + index * rate_limit / 1000.0))
+
+
+async def main(loop):
+    buckets = [throttle({
+        'loop': loop,
+        'refillRate': 1.0 / rate_limit,
+        'capacity': 1.0,
+    }) for i in range(0, num_instances)]
+    lateness = []
+    first = {}
+    tasks = []
+    for bucket in buckets:
+        for i in range(0, calls_per_instance):
+            tasks.append(worker(bucket, i, first, lateness))
+    cpu = time.process_time()
+    wall = time.time()
+    await asyncio.gather(*tasks)
+    cpu = time.process_time() - cpu
+    wall = time.time() - wall
+    lateness = sorted(lateness)
+    print('instances: {}, queued calls: {}'.format(num_instances, len(tasks)))
+    print('wall time: {:.3f} s, cpu time: {:.3f} s ({:.1f}% of one core)'.format(wall, cpu, 100.0 * cpu / wall))
+    print('lateness vs ideal schedule: mean {:.3f} ms, p99 {:.3f} ms, max {:.3f} ms'.format(
+        1000.0 * sum(lateness) / len(lateness),
+        1000.0 * lateness[int(len(lateness) * 0.99)],
+        1000.0 * lateness[-1]))
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(main(loop))
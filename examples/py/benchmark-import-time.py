@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+# Measures the time it takes a fresh interpreter to import ccxt, to resolve a
+# single exchange class and to resolve all of them
+
+import os
+import subprocess
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+python = root + '/python'
+
+# -----------------------------------------------------------------------------
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+scenarios = [
+    ('python startup only', 'pass'),
+    ('import ccxt', 'import ccxt'),
+    ('import ccxt + ccxt.binance', 'import ccxt; ccxt.binance'),
+    ('import ccxt + all exchanges', '\n'.join([
+        'import ccxt',
+        'for id in ccxt.exchanges:',
+        '    try:',
+        '        getattr(ccxt, id)',
+        '    except ImportError:',
+        '        pass',
+    ])),
+]
+
+
+def measure(code):
+    env = dict(os.environ, PYTHONPATH=python, PYTHONDONTWRITEBYTECODE='')
+    timings = []
+    for i in range(0, runs):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', code], env=env)
+        timings.append(time.time() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+for name, code in scenarios:
+    best, mean = measure(code)
+    print('{:<32} best {:8.1f} ms   mean {:8.1f} ms'.format(name, best * 1000, mean * 1000))
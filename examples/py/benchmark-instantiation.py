@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Measures the cost of creating exchange instances for every exchange
+
+import os
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+# -----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# -----------------------------------------------------------------------------
+
+num_instances = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+classes = []
+for id in ccxt.exchanges:
+    try:
+        classes.append(getattr(ccxt, id))
+    except ImportError:  # listed in ccxt.exchanges but not transpiled
+        pass
+
+results = []
+total = 0
+for exchange_class in classes:
+    exchange_class()  # warm up, the first instance may do per-class work
+    start = time.time()
+    for i in range(0, num_instances):
+        exchange_class()
+    elapsed = time.time() - start
+    total += elapsed
+    results.append((elapsed / num_instances, exchange_class.__name__))
+
+for elapsed, id in sorted(results, reverse=True)[0:10]:
+    print('{:<20} {:8.3f} ms per instance'.format(id, elapsed * 1000))
+
+print('{} exchanges x {} instances: {:.3f} s total, {:.3f} ms per instance on average'.format(
+    len(classes), num_instances, total, total * 1000 / (len(classes) * num_instances)))
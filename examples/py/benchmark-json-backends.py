@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# Compares the installed JSON backends on payloads shaped like the largest
+# REST responses: an order book, a list of trades, exchangeInfo and market
+# summaries. Pass a directory of recorded response bodies (*.json) to
+# benchmark those instead of the generated ones.
+
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+# -----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.json_backend import json_backends, json_loads  # noqa: E402
+
+# -----------------------------------------------------------------------------
+
+random.seed(42)
+
+
+def price():
+    return '%.8f' % random.uniform(0.0001, 20000)
+
+
+def fixtures():
+    return {
+        # poloniex returnOrderBook?currencyPair=all&depth=50
+        'poloniex returnOrderBook': dict([('BTC_COIN%d' % i, {
+            'asks': [[price(), random.uniform(0, 1000)] for j in range(0, 50)],
+            'bids': [[price(), random.uniform(0, 1000)] for j in range(0, 50)],
+            'isFrozen': '0',
+            'seq': random.randint(0, 10 ** 9),
+        }) for i in range(0, 100)]),
+        # kraken Trades
+        'kraken Trades': {'error': [], 'result': {
+            'XXBTZUSD': [[price(), '%.8f' % random.uniform(0, 10), random.uniform(1.5e9, 1.6e9), random.choice('bs'), random.choice('ml'), ''] for i in range(0, 1000)],
+            'last': '1517474200123456789',
+        }},
+        # binance exchangeInfo
+        'binance exchangeInfo': {'timezone': 'UTC', 'serverTime': 1517474200000, 'symbols': [{
+            'symbol': 'COIN%dBTC' % i,
+            'status': 'TRADING',
+            'baseAsset': 'COIN%d' % i,
+            'baseAssetPrecision': 8,
+            'quoteAsset': 'BTC',
+            'quotePrecision': 8,
+            'orderTypes': ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+            'icebergAllowed': True,
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.00000001', 'maxPrice': '100000.00000000', 'tickSize': '0.00000001'},
+                {'filterType': 'LOT_SIZE', 'minQty': '1.00000000', 'maxQty': '90000000.00000000', 'stepSize': '1.00000000'},
+                {'filterType': 'MIN_NOTIONAL', 'minNotional': '0.00100000'},
+            ],
+        } for i in range(0, 300)]},
+        # bittrex getmarketsummaries
+        'bittrex getmarketsummaries': {'success': True, 'message': '', 'result': [{
+            'MarketName': 'BTC-COIN%d' % i,
+            'High': random.uniform(0, 1),
+            'Low': random.uniform(0, 1),
+            'Volume': random.uniform(0, 10 ** 7),
+            'Last': random.uniform(0, 1),
+            'BaseVolume': random.uniform(0, 1000),
+            'TimeStamp': '2018-02-01T08:36:40.123',
+            'Bid': random.uniform(0, 1),
+            'Ask': random.uniform(0, 1),
+            'OpenBuyOrders': random.randint(0, 10000),
+            'OpenSellOrders': random.randint(0, 10000),
+            'PrevDay': random.uniform(0, 1),
+            'Created': '2014-02-13T00:00:00',
+        } for i in range(0, 300)]},
+    }
+
+
+if len(sys.argv) > 1:
+    payloads = dict([(os.path.basename(path), open(path, 'rb').read()) for path in sorted(glob.glob(os.path.join(sys.argv[1], '*.json')))])
+else:
+    payloads = dict([(name, json.dumps(fixture).encode('utf-8')) for name, fixture in fixtures().items()])
+
+backends = []
+for backend in sorted(json_backends.keys()):
+    try:
+        backends.append((backend, json_loads(backend)))
+    except ccxt.NotSupported:
+        print(backend, 'is not installed')
+
+exchange = ccxt.Exchange()
+url = 'https://example.com'
+
+for name, payload in sorted(payloads.items()):
+    print('{} ({} KB)'.format(name, len(payload) // 1024))
+    expected = json.loads(payload.decode('utf-8'))
+    for backend, loads in backends:
+        # parse through handle_rest_response, from bytes as the sync fetch does
+        exchange.jsonBackend = backend
+        assert exchange.handle_rest_response(payload, url) == expected
+        runs = 0
+        start = time.time()
+        while time.time() - start < 1:
+            exchange.handle_rest_response(payload, url)
+            runs += 1
+        elapsed = (time.time() - start) / runs
+        print('    {:<12} {:8.3f} ms per response'.format(backend, elapsed * 1000))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Compares requests/sec of the synchronous Exchange.fetch with and without the
+# keep-alive connection pool against a local HTTP/1.1 server
+
+import os
+import sys
+import threading
+import time
+
+# -----------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler  # Python 3
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler  # Python 2
+    from SocketServer import ThreadingMixIn
+
+# -----------------------------------------------------------------------------
+
+payload = b'{"symbol":"BTCUSDT","bidPrice":"7000.01","askPrice":"7000.02"}'
+num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+
+class KeepAliveRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def benchmark(exchange, url):
+    start = time.time()
+    for i in range(0, num_requests):
+        exchange.fetch(url)
+    return num_requests / (time.time() - start)
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveRequestHandler)
+thread = threading.Thread(target=server.serve_forever)
+thread.daemon = True
+thread.start()
+
+url = 'http://127.0.0.1:' + str(server.server_address[1]) + '/api/v3/ticker/bookTicker'
+
+before = benchmark(Exchange({'id': 'benchmark'}), url)
+print('new connection per request: {:10.1f} requests/sec'.format(before))
+
+exchange = Exchange({'id': 'benchmark', 'keepAlive': True})
+after = benchmark(exchange, url)
+print('keep-alive connection pool: {:10.1f} requests/sec'.format(after))
+print('speedup: {:.2f}x'.format(after / before), exchange.connection_pool.stats)
+
+server.shutdown()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Times the sign() of a private endpoint of every exchange with the keyed HMAC
+# prototypes of exchange.keyed_hmac and with a plain hmac.new() per request.
+# Pass exchange ids to benchmark those only.
+
+import base64
+import os
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+# -----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# -----------------------------------------------------------------------------
+
+credentials = {
+    'apiKey': 'a' * 64,
+    'secret': base64.b64encode(b's' * 64).decode('ascii'),  # kraken and gdax expect a base64 secret
+    'uid': '123456',
+    'password': 'password',
+}
+
+
+def private_endpoint(exchange):
+    for (api, method, path), endpoint in sorted(exchange.api_endpoints.items()):
+        if api not in exchange.publicApis and '{' not in path:
+            return (path, api, method)
+    return None
+
+
+def time_sign(exchange, endpoint, params, rounds=5, runs=200):
+    path, api, method = endpoint
+    best = None
+    for i in range(0, rounds):
+        start = time.time()
+        for j in range(0, runs):
+            exchange.sign(path, api, method, dict(params))
+        elapsed = (time.time() - start) / runs * 1000000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+ids = sys.argv[1:] or ccxt.exchanges
+total = [0, 0]
+
+params = {'symbol': 'BTCUSD', 'amount': '1.0', 'price': '7000.0'}
+
+for id in ids:
+    try:
+        exchange = getattr(ccxt, id)(credentials)
+        endpoint = private_endpoint(exchange) if exchange.api_endpoints else None
+        if not endpoint:
+            continue
+        exchange.sign(endpoint[0], endpoint[1], endpoint[2], dict(params))
+    except Exception as e:
+        print('{:<16} skipped, {}'.format(id, type(e).__name__))
+        continue
+    exchange.hmac = Exchange.hmac  # hmac.new() per request
+    before = time_sign(exchange, endpoint, params)
+    exchange.hmac = exchange.keyed_hmac
+    after = time_sign(exchange, endpoint, params)
+    total[0] += before
+    total[1] += after
+    print('{:<16} {:>7.1f} µs {:>7.1f} µs per sign() of {} {} {}'.format(id, before, after, endpoint[2], endpoint[1], endpoint[0]))
+
+print('{:<16} {:>7.1f} µs {:>7.1f} µs'.format('total', total[0], total[1]))
@@ -687,7 +687,7 @@ class binance extends Exchange {
             $url .= '.html';
         if (($api == 'private') || ($api == 'wapi')) {
             $this->check_required_credentials();
-            $nonce = $this->milliseconds ();
+            $nonce = $this->nonce ();
             $query = $this->urlencode (array_merge (array ( 'timestamp' => $nonce ), $params));
             $signature = $this->hmac ($this->encode ($query), $this->encode ($this->secret));
             $query .= '&' . 'signature=' . $signature;
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from ccxt.base import errors
-from ccxt.async.base import exchange
+from ccxt.base.lazy_module import lazy_module
 
 from ccxt.base.errors import BaseError             # noqa: F401
 from ccxt.base.errors import ExchangeError         # noqa: F401
@@ -18,4 +18,6 @@ from ccxt.base.errors import DDoSProtection        # noqa: F401
 from ccxt.base.errors import RequestTimeout        # noqa: F401
 from ccxt.base.errors import ExchangeNotAvailable  # noqa: F401
 
-__all__ = exchange.__all__ + errors.__all__  # noqa: F405
+__all__ = ['Exchange'] + errors.__all__  # noqa: F405
+
+lazy_module(__name__, {'Exchange': 'ccxt.async.base.exchange'})
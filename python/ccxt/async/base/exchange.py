@@ -8,6 +8,7 @@ __version__ = '1.10.387'
 
 import asyncio
 import concurrent
+import copy
 import socket
 import time
 import math
@@ -17,11 +18,16 @@ import aiohttp
 
 # -----------------------------------------------------------------------------
 
+from ccxt.async.base.session_manager import SessionManager
+from ccxt.async.base.throttle import shared_throttle
 from ccxt.async.base.throttle import throttle
 
 # -----------------------------------------------------------------------------
 
+from ccxt.base.errors import BaseError
 from ccxt.base.errors import ExchangeError
+from ccxt.base.errors import DDoSProtection
+from ccxt.base.errors import ExchangeNotAvailable
 from ccxt.base.errors import RequestTimeout
 
 # -----------------------------------------------------------------------------
@@ -40,20 +46,56 @@ __all__ = [
 
 class Exchange(BaseExchange):
 
+    own_session = False  # False when aiohttp_session was passed in or comes from a session_manager
+
     def __init__(self, config={}):
         super(Exchange, self).__init__(config)
         self.asyncio_loop = self.asyncio_loop or asyncio.get_event_loop()
-        self.aiohttp_session = self.aiohttp_session or aiohttp.ClientSession(loop=self.asyncio_loop)
-        self.init_rest_rate_limiter()
+        if not self.aiohttp_session:
+            if self.shareSession or self.session_manager:
+                self.session_manager = self.session_manager or SessionManager.shared(self.asyncio_loop)
+                self.aiohttp_session = self.session_manager.acquire()
+            else:
+                self.aiohttp_session = aiohttp.ClientSession(loop=self.asyncio_loop)
+                self.own_session = True
 
     def __del__(self):
-        if self.aiohttp_session:
-            self.aiohttp_session.close()
+        # nothing can be awaited here, drop the sockets of a session that was not closed
+        session = self.aiohttp_session
+        if self.own_session:
+            if session and not session.closed:
+                session.connector.close()
+        elif session and self.session_manager and (session is self.session_manager.session):
+            # or the shared session would never see its last release
+            self.session_manager.release_nowait()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the aiohttp session of this exchange or releases the shared one"""
+        session, self.aiohttp_session = self.aiohttp_session, None
+        if session:
+            if self.own_session:
+                await session.close()
+            elif self.session_manager and (session is self.session_manager.session):
+                await self.session_manager.release()
 
     def init_rest_rate_limiter(self):
-        self.throttle = throttle(self.extend({
-            'loop': self.asyncio_loop,
-        }, self.tokenBucket))
+        self.asyncio_loop = self.asyncio_loop or asyncio.get_event_loop()
+        if self.rateLimitFile:
+            self.throttles = self.create_token_buckets(shared_throttle, {
+                'loop': self.asyncio_loop,
+                'file': self.rateLimitFile,
+            })
+        else:
+            self.throttles = self.create_token_buckets(throttle, {
+                'loop': self.asyncio_loop,
+            })
+        self.throttle = self.throttles['default']
 
     async def wait_for_token(self):
         while self.rateLimitTokens <= 1:
@@ -77,11 +119,99 @@ class Exchange(BaseExchange):
 
     async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """A better wrapper over request for deferred signing"""
-        if self.enableRateLimit:
-            await self.throttle()
+        if not self.retryPolicy['maxRetries']:
+            return await self.fetch_once(path, api, method, params, headers, body)
+        deadline = self.milliseconds() + self.retryPolicy['deadline']
+        attempt = 0
+        while True:
+            try:
+                # every attempt is signed anew, with a fresh nonce
+                return await self.fetch_once(path, api, method, params, headers, body)
+            except BaseError as e:
+                delay = self.retry_delay(e, attempt, deadline, path, api, method)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay / 1000.0)
+            attempt += 1
+
+    async def fetch_once(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        breaker = self.api_circuit_breaker(api)
+        if not breaker:
+            return await self.send_request(path, api, method, params, headers, body)
+        if not breaker.allow():
+            raise self.circuit_open_error(breaker, path, method)
+        # an interrupted or rate limited call neither proves nor disproves the health of the exchange
+        outcome = breaker.release
+        try:
+            response = await self.send_request(path, api, method, params, headers, body)
+            outcome = breaker.success
+            return response
+        except (DDoSProtection, asyncio.CancelledError):  # CancelledError is an Exception before Python 3.8
+            raise
+        except Exception as e:
+            outcome = breaker.failure if self.is_circuit_failure(e) else breaker.success
+            raise
+        finally:
+            outcome()
+
+    async def send_request(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        throttle, cost = self.endpoint_throttle(path, api, method) if self.enableRateLimit else (None, None)
+        lane = self.request_priority(path, api, method, params) if throttle else None
+        if 'throttlePriority' in params:
+            params = self.omit(params, 'throttlePriority')
+        ttl = self.response_cache_ttl(path, api, method)
+        coalesce = self.coalesceRequests and (method == 'GET') and (api in self.publicApis)
+        if ttl or coalesce:
+            request = self.sign(path, api, method, params, headers, body)
+            if ttl:
+                cached = self.response_cache.get(self.request_key(request))
+                if cached is not None:
+                    return self.handle_rest_response(cached, request['url'], request['method'], request['headers'], request['body'])
+            if coalesce:
+                return await self.fetch_coalesced(request, throttle, cost, ttl, lane)
+            return await self.fetch_signed(request, throttle, cost, ttl, lane)
+        if throttle:
+            await throttle(cost, lane)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        return await self.fetch_request(request, throttle)
+
+    async def fetch_coalesced(self, request, throttle=None, cost=None, ttl=None, lane=None):
+        """Sends identical concurrent unsigned requests once, through the rate limiter once"""
+        key = ('fetch',) + self.request_key(request)
+        flight = self.join_flight(key, self.fetch_signed, request, throttle, cost, ttl, lane)
+        response = await asyncio.shield(flight['future'])
+        # the callers that shared the request each get a private copy of the response
+        return copy.deepcopy(response) if flight['callers'] > 1 else response
+
+    async def fetch_signed(self, request, throttle=None, cost=None, ttl=None, lane=None):
+        if throttle:
+            await throttle(cost, lane)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        response = await self.fetch_request(request, throttle)
+        if ttl:
+            # handle_rest_response has set the body right before fetch returned, no other coroutine ran since
+            self.response_cache.set(self.request_key(request), self.http_response_body, ttl)
+        return response
+
+    async def fetch_request(self, request, throttle=None):
+        if not (throttle and self.adaptiveRateLimit):
+            return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        try:
+            response = await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        except (DDoSProtection, ExchangeNotAvailable) as e:
+            self.slow_down(throttle, e)
+            raise
+        self.speed_up(throttle)
+        return response
+
+    def raise_unreachable(self, url, method, error):
+        """Raises an ExchangeError for a request that did not get a response, marked as unreachable for the circuit breakers"""
+        try:
+            self.raise_error(ExchangeError, url, method, error, None)
+        except ExchangeError as e:
+            e.unreachable = True
+            raise
 
     async def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -102,31 +232,75 @@ class Exchange(BaseExchange):
         session_method = getattr(self.aiohttp_session, method.lower())
         try:
             async with session_method(url, data=encoded_body, headers=headers, timeout=(self.timeout / 1000), proxy=self.aiohttp_proxy) as response:
-                text = await response.text()
+                # decoding the raw bytes skips the charset detection of response.text() on every call
+                http_response = await response.read()
+                self.last_http_status_code = response.status
+                self.last_response_headers = response.headers
+                self.last_http_response = text = self.decode_response(http_response, response.charset)
                 self.handle_errors(response.status, text, url, method, None, text)
                 self.handle_rest_errors(None, response.status, text, url, method)
+        except BaseError as e:
+            self.annotate_error(e, response.status, response.headers)
+            raise
         except socket.gaierror as e:
-            self.raise_error(ExchangeError, url, method, e, None)
+            self.raise_unreachable(url, method, e)
         except concurrent.futures._base.TimeoutError as e:
             raise RequestTimeout(' '.join([self.id, method, url, 'request timeout']))
         except aiohttp.client_exceptions.ServerDisconnectedError as e:
-            self.raise_error(ExchangeError, url, method, e, None)
+            self.raise_unreachable(url, method, e)
         except aiohttp.client_exceptions.ClientConnectorError as e:
-            self.raise_error(ExchangeError, url, method, e, None)
+            self.raise_unreachable(url, method, e)
         if self.verbose:
             print(method, url, "\nResponse:", headers, text)
+        # the JSON backend parses utf-8 bytes as they are, other charsets from the decoded text
+        if (response.charset or 'utf-8').lower() in ('utf-8', 'utf8'):
+            return self.handle_rest_response(http_response, url, method, headers, body)
         return self.handle_rest_response(text, url, method, headers, body)
 
+    def join_flight(self, key, coroutine, *args):
+        """Returns the flight of key, starting coroutine(*args) in a task if there is none"""
+        flight = self.in_flight.get(key)
+        if flight is None:
+            flight = self.in_flight[key] = {
+                'future': self.asyncio_loop.create_task(coroutine(*args)),
+                'callers': 0,
+            }
+
+            def done(future):
+                if self.in_flight.get(key) is flight:
+                    del self.in_flight[key]
+
+            flight['future'].add_done_callback(done)
+        flight['callers'] += 1
+        return flight
+
+    async def single_flight(self, key, coroutine, *args):
+        """Awaits coroutine(*args) once per key at a time, concurrent callers share its outcome"""
+        flight = self.join_flight(key, coroutine, *args)
+        # a cancelled caller must not cancel the call for everyone else
+        return await asyncio.shield(flight['future'])
+
     async def load_markets(self, reload=False):
         if not reload:
             if self.markets:
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        # concurrent coroutines wait for a single load instead of each fetching the markets
+        return await self.single_flight(('load_markets', reload), self.load_markets_helper, reload)
+
+    async def load_markets_helper(self, reload=False):
+        if not reload:
+            if self.markets:
+                return self.markets
+            cached = self.load_markets_cache()
+            if cached:
+                return self.set_markets(cached['markets'], cached['currencies'])
         markets = await self.fetch_markets()
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = await self.fetch_currencies()
+        self.save_markets_cache(markets, currencies)
         return self.set_markets(markets, currencies)
 
     async def fetch_order_status(self, id, market=None):
@@ -139,10 +313,19 @@ class Exchange(BaseExchange):
 
     async def fetch_l2_order_book(self, symbol, params={}):
         orderbook = await self.fetch_order_book(symbol, params)
-        return self.extend(orderbook, {
-            'bids': self.sort_by(self.aggregate(orderbook['bids']), 0, True),
-            'asks': self.sort_by(self.aggregate(orderbook['asks']), 0),
-        })
+        return self.aggregate_order_book(orderbook)
+
+    async def fetch_ohlcv_range(self, symbol, timeframe='1m', since=None, until=None, params={}):
+        # the windows are fetched concurrently, the rate limiter spaces the calls
+        windows = self.ohlcv_windows(timeframe, since, until)
+        semaphore = asyncio.Semaphore(self.ohlcvRangeConcurrency)
+
+        async def fetch_window(start, limit):
+            async with semaphore:
+                return await self.fetch_ohlcv(symbol, timeframe, start, limit, params)
+
+        results = await asyncio.gather(*[fetch_window(start, limit) for start, limit in windows])
+        return self.merge_ohlcv_windows(results, timeframe, windows, until)
 
     async def update_order(self, id, symbol, *args):
         if not self.enableRateLimit:
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from ccxt.base.ohlcv_store import OhlcvStore as BaseOhlcvStore
+
+__all__ = [
+    'OhlcvStore',
+]
+
+
+class OhlcvStore(BaseOhlcvStore):
+    """OhlcvStore that syncs from an async exchange, whose fetch_ohlcv_range fetches the windows concurrently"""
+
+    async def sync(self, exchange, symbol, timeframe='1m', since=None, until=None):
+        since, until, gaps = self.sync_range(exchange, symbol, timeframe, since, until)
+        for start, end in self.unchecked(exchange.id, symbol, timeframe, gaps):
+            result = await exchange.fetch_ohlcv_range(symbol, timeframe, start, end)
+            self.store_range(exchange, symbol, timeframe, end, result)
+        return self.sync_range(exchange, symbol, timeframe, since, until)[2]
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""A process-wide aiohttp session shared by async exchange instances"""
+
+# -----------------------------------------------------------------------------
+
+import aiohttp
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'SessionManager',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class SessionManager(object):
+    """Owns one aiohttp session per event loop for the exchanges that opt in
+
+    All of the exchanges that share a manager go through a single connector,
+    so they share its keep-alive connections (limited per host) and its DNS
+    cache. The session is created by the first acquire() and closed when the
+    last exchange releases it."""
+
+    managers = {}  # event loop → default manager
+
+    def __init__(self, loop, limit=100, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=30):
+        self.loop = loop
+        self.limit = limit                          # connections in total, 0 for no limit
+        self.limit_per_host = limit_per_host        # connections per (host, port, ssl), 0 for no limit
+        self.ttl_dns_cache = ttl_dns_cache          # seconds
+        self.keepalive_timeout = keepalive_timeout  # seconds
+        self.session = None
+        self.references = 0
+        self.stats = {
+            'requests': 0,
+            'created': 0,
+            'reused': 0,
+            'dnsCacheHits': 0,
+            'dnsCacheMisses': 0,
+        }
+
+    @classmethod
+    def shared(cls, loop):
+        """Returns the default manager of an event loop"""
+        manager = cls.managers.get(loop)
+        if manager is None:
+            manager = cls.managers[loop] = cls(loop)
+        return manager
+
+    def acquire(self):
+        """Returns the shared session, counting one more exchange that uses it"""
+        if self.session is None or self.session.closed:
+            self.session = self.create_session()
+        self.references += 1
+        return self.session
+
+    async def release(self):
+        """Closes the shared session once no exchange uses it anymore"""
+        session = self.detach()
+        if session:
+            await session.close()
+
+    def release_nowait(self):
+        """Releases without awaiting, for an exchange that is garbage-collected without close()"""
+        session = self.detach()
+        if session and not session.closed:
+            session.connector.close()
+
+    def detach(self):
+        # counts one exchange less, returns the session to close after the last one
+        self.references = max(self.references - 1, 0)
+        if self.references or not self.session:
+            return None
+        session, self.session = self.session, None
+        if self.managers.get(self.loop) is self:
+            del self.managers[self.loop]
+        return session
+
+    def create_session(self):
+        connector = aiohttp.TCPConnector(
+            loop=self.loop,
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.ttl_dns_cache,
+            keepalive_timeout=self.keepalive_timeout)
+        options = {}
+        if hasattr(aiohttp, 'TraceConfig'):  # aiohttp 3+
+            options['trace_configs'] = [self.trace_config()]
+        return aiohttp.ClientSession(loop=self.loop, connector=connector, **options)
+
+    def trace_config(self):
+        trace_config = aiohttp.TraceConfig()
+
+        def count(key):
+            async def counter(session, context, params):
+                self.stats[key] += 1
+            return counter
+
+        trace_config.on_request_start.append(count('requests'))
+        trace_config.on_connection_create_end.append(count('created'))
+        trace_config.on_connection_reuseconn.append(count('reused'))
+        trace_config.on_dns_cache_hit.append(count('dnsCacheHits'))
+        trace_config.on_dns_cache_miss.append(count('dnsCacheMisses'))
+        return trace_config
@@ -1,50 +1,163 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import Queue, sleep, Future, ensure_future, get_event_loop
-from time import time
+from asyncio import get_event_loop
+from asyncio import sleep
+from collections import OrderedDict
+from collections import deque
+
+from ccxt.base.token_bucket_file import TokenBucketFile
 
 __all__ = [
+    'shared_throttle',
     'throttle',
 ]
 
 
 def throttle(config=None):
+    """Event-driven token bucket with priority lanes
+
+    Instead of polling, the bucket computes the exact moment the next token
+    becomes available for the next waiter and arms a single loop timer for it.
+    Waiters queue in lanes, the first lane in cfg['lanes'] is served first and
+    each lane is FIFO. A waiter at the head of a lane that has waited longer
+    than the starvationTimeout goes before any other, so busy urgent lanes
+    cannot hold back the rest forever. Each waiter consumes its own cost, and
+    a waiter that gets cancelled is dropped without consuming any tokens."""
 
     cfg = {
-        'lastTimestamp': time(),
-        'numTokens': 0,
-        'running': False,
-        'queue': Queue(),
-        'loop': get_event_loop(),
-        'delay': 0.001,
-        'refillRate': 0.001,
+        'loop': None,
+        'refillRate': 0.001,  # tokens per millisecond
         'defaultCost': 1.000,
         'capacity': 1.000,
         'maxCapacity': 100,
+        'lanes': ['cancel', 'create', 'private', 'public'],  # most urgent first
+        'starvationTimeout': 1000,  # milliseconds
     }
 
-    cfg.update(config)
-
-    async def run():
-        if not cfg['running']:
-            cfg['running'] = True
-            while not cfg['queue'].empty():
-                now = time()
-                elapsed = (now - cfg['lastTimestamp'])
-                cfg['lastTimestamp'] = now
-                cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
-                if cfg['numTokens'] > 0:
-                    if not cfg['queue'].empty():
-                        cost, future = cfg['queue'].get_nowait()
-                        cfg['numTokens'] -= (cost if cost else cfg['defaultCost'])
-                        future.set_result(None)
-                await sleep(cfg['delay'])
-            cfg['running'] = False
-
-    def throttle(cost=None):
-        future = Future()
-        cfg['queue'].put_nowait((cost, future))
-        ensure_future(run())
+    cfg.update(config or {})
+
+    loop = cfg['loop'] or get_event_loop()
+    queues = OrderedDict((lane, deque()) for lane in cfg['lanes'])
+    stats = dict((lane, {'granted': 0, 'waited': 0.0, 'maxDepth': 0}) for lane in cfg['lanes'])
+    default_lane = cfg['lanes'][-1]
+    timer = None
+
+    cfg['loop'] = loop
+    cfg['lastTimestamp'] = loop.time()
+    cfg['numTokens'] = cfg.get('numTokens', cfg['capacity'])
+
+    def waiting():
+        return any(queues.values())
+
+    def refill():
+        now = loop.time()
+        elapsed = (now - cfg['lastTimestamp']) * 1000
+        cfg['lastTimestamp'] = now
+        num_tokens = cfg['numTokens'] + elapsed * cfg['refillRate']
+        # while waiters are queued, tokens accrued past the timer deadline are owed to them,
+        # clamping those to the capacity would make every late wakeup push the schedule back
+        cfg['numTokens'] = num_tokens if waiting() else min(cfg['capacity'], num_tokens)
+
+    def next_lane():
+        oldest = None
+        for queue in queues.values():
+            while queue and queue[0][1].done():  # cancelled while waiting
+                queue.popleft()
+            if queue and ((oldest is None) or (queue[0][2] < oldest[0][2])):
+                oldest = queue
+        if oldest is None:
+            return None
+        if (loop.time() - oldest[0][2]) * 1000 > cfg['starvationTimeout']:
+            return oldest
+        return next(queue for queue in queues.values() if queue)
+
+    def run():
+        nonlocal timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        refill()
+        queue = next_lane()
+        while queue:
+            cost, future, timestamp, lane = queue[0]
+            required = min(cost, cfg['capacity'])
+            missing = required - cfg['numTokens']
+            if missing > 1e-9:
+                timer = loop.call_later(missing / cfg['refillRate'] / 1000, run)
+                return
+            cfg['numTokens'] -= cost
+            queue.popleft()
+            stats[lane]['granted'] += 1
+            stats[lane]['waited'] += loop.time() - timestamp
+            future.set_result(None)
+            queue = next_lane()
+
+    def on_done(future):
+        if future.cancelled():
+            # the next waiter may need fewer tokens than the one that went away
+            loop.call_soon(run)
+
+    def throttle(cost=None, lane=None):
+        future = loop.create_future()
+        future.add_done_callback(on_done)
+        if timer is None:
+            refill()
+        lane = lane if lane in queues else default_lane
+        queue = queues[lane]
+        queue.append((cfg['defaultCost'] if cost is None else cost, future, loop.time(), lane))
+        stats[lane]['maxDepth'] = max(stats[lane]['maxDepth'], len(queue))
+        if timer is None:
+            run()
         return future
 
+    def pause(milliseconds):
+        """Puts the bucket in debt for the next calls to wait at least that long"""
+        refill()
+        cfg['numTokens'] = min(cfg['numTokens'], -milliseconds * cfg['refillRate'])
+        if timer is not None:
+            run()  # push back the wakeup of the next waiter
+
+    def depths():
+        """Returns the number of waiters in each lane"""
+        return dict((lane, len(queue)) for lane, queue in queues.items())
+
+    throttle.cfg = cfg
+    throttle.pause = pause
+    throttle.queues = queues
+    throttle.depths = depths
+    throttle.stats = stats
+    return throttle
+
+
+def shared_throttle(config=None):
+    """Token bucket kept in a TokenBucketFile, shared by every process that opens the file with the same key
+
+    The cost of a call is taken when it is made, a call that is cancelled
+    while it waits for its turn does not give its tokens back."""
+
+    cfg = {
+        'loop': None,
+        'refillRate': 0.001,  # tokens per millisecond
+        'defaultCost': 1.000,
+        'capacity': 1.000,
+        'file': None,         # path
+        'key': 'default',
+    }
+
+    cfg.update(config or {})
+
+    bucket_file = TokenBucketFile.open(cfg['file'])
+
+    async def throttle(cost=None, lane=None):
+        # calls are served in the order they are made across processes, there are no lanes to jump
+        delay = bucket_file.update(cfg['key'], cfg, cfg['defaultCost'] if cost is None else cost)
+        if delay > 0:
+            await sleep(delay / 1000)
+
+    def pause(milliseconds):
+        """Puts the bucket in debt for the next calls of all processes to wait at least that long"""
+        bucket_file.update(cfg['key'], cfg, 0, milliseconds * cfg['refillRate'])
+
+    throttle.cfg = cfg
+    throttle.pause = pause
     return throttle
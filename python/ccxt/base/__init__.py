@@ -25,7 +25,7 @@ SOFTWARE.
 """
 
 from ccxt.base import errors
-from ccxt.base import exchange
+from ccxt.base.lazy_module import lazy_module
 
 from ccxt.base.errors import BaseError             # noqa: F401
 from ccxt.base.errors import ExchangeError         # noqa: F401
@@ -42,4 +42,6 @@ from ccxt.base.errors import DDoSProtection        # noqa: F401
 from ccxt.base.errors import RequestTimeout        # noqa: F401
 from ccxt.base.errors import ExchangeNotAvailable  # noqa: F401
 
-__all__ = exchange.__all__ + errors.__all__  # noqa: F405
+__all__ = ['Exchange'] + errors.__all__  # noqa: F405
+
+lazy_module(__name__, {'Exchange': 'ccxt.base.exchange'})
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""Circuit breaker that stops calling an exchange which keeps failing"""
+
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'CircuitBreaker',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class CircuitBreaker(object):
+    """Counts consecutive failures and opens after failure_threshold of them
+
+    While open, calls are refused right away. Once reset_timeout milliseconds
+    have passed it turns half-open and lets up to half_open_probes calls
+    through, the first success closes it again and a failure opens it for
+    another reset_timeout."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30000, half_open_probes=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout  # milliseconds
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.failures = 0  # consecutive
+        self.probes = 0    # calls in flight while half-open
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def milliseconds():
+        return int(time.time() * 1000)
+
+    def allow(self):
+        """Returns True if a call may go ahead, a call that is allowed must report its outcome"""
+        with self.lock:
+            if self.state == self.OPEN:
+                if self.milliseconds() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self.probes = 0
+            if self.state == self.HALF_OPEN:
+                if self.probes >= self.half_open_probes:
+                    return False
+                self.probes += 1
+            return True
+
+    def success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probes = 0
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if (self.state == self.HALF_OPEN) or (self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = self.milliseconds()
+                self.probes = 0
+
+    def release(self):
+        """Reports a call that neither proves nor disproves the health of the exchange"""
+        with self.lock:
+            if (self.state == self.HALF_OPEN) and self.probes:
+                self.probes -= 1
+
+    def retry_in(self):
+        """Returns the milliseconds until an open breaker lets a probe through"""
+        if self.state != self.OPEN:
+            return 0
+        return max(self.reset_timeout - (self.milliseconds() - self.opened_at), 0)
+
+    def status(self):
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'openedAt': self.opened_at,
+            'retryIn': self.retry_in(),
+        }
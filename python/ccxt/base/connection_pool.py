@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""Persistent HTTP/1.1 connection pool for the synchronous Exchange"""
+
+# -----------------------------------------------------------------------------
+
+import io
+import select
+import socket
+import threading
+import time
+
+# -----------------------------------------------------------------------------
+
+try:
+    import urllib.parse as _urlparse   # Python 3
+    import urllib.request as _urllib
+    import http.client as httplib
+except ImportError:
+    import urlparse as _urlparse       # Python 2
+    import urllib2 as _urllib
+    import httplib
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ConnectionPool',
+]
+
+# -----------------------------------------------------------------------------
+
+try:
+    monotonic = time.monotonic  # Python 3
+except AttributeError:
+    monotonic = time.time       # Python 2
+
+# -----------------------------------------------------------------------------
+
+
+class ConnectionPool(object):
+    """A thread-safe pool of keep-alive connections keyed by (scheme, host, port)
+
+    Exposes the same open(request, timeout) call as a urllib opener, so that
+    Exchange.fetch can use either one interchangeably. Responses other than 2xx
+    are raised as urllib HTTPError and connection failures as URLError, which
+    keeps the error mapping of Exchange.fetch unchanged. Redirects are not
+    followed. A request that fails on a reused connection is sent again on a
+    fresh one only if it could not be written. Once written it may have reached
+    the exchange, which places orders over GETs too, so it is never resent."""
+
+    def __init__(self, max_connections_per_host=10, idle_timeout=60.0):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout  # seconds
+        self.idle = {}    # key → list of (connection, last used timestamp)
+        self.active = {}  # key → number of checked out connections
+        self.condition = threading.Condition()
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'evicted': 0,
+        }
+
+    @staticmethod
+    def key(url):
+        parsed = _urlparse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        return (scheme, parsed.hostname, port)
+
+    def create_connection(self, key, timeout):
+        scheme, host, port = key
+        connection_class = httplib.HTTPSConnection if scheme == 'https' else httplib.HTTPConnection
+        with self.condition:
+            self.stats['created'] += 1
+        return connection_class(host, port, timeout=timeout)
+
+    def evict_idle_connections(self, now):
+        # must be called with self.condition held
+        for key in list(self.idle.keys()):
+            connections = self.idle[key]
+            fresh = [entry for entry in connections if now - entry[1] < self.idle_timeout]
+            for connection, timestamp in connections:
+                if now - timestamp >= self.idle_timeout:
+                    connection.close()
+                    self.stats['evicted'] += 1
+            if fresh:
+                self.idle[key] = fresh
+            else:
+                del self.idle[key]
+
+    def acquire(self, key, timeout):
+        """Returns (connection, reused), blocks while the per-host cap is reached"""
+        deadline = monotonic() + timeout
+        with self.condition:
+            while True:
+                now = monotonic()
+                self.evict_idle_connections(now)
+                if key in self.idle:
+                    connection, timestamp = self.idle[key].pop()
+                    if not self.idle[key]:
+                        del self.idle[key]
+                    self.active[key] = self.active.get(key, 0) + 1
+                    self.stats['reused'] += 1
+                    return connection, True
+                if self.active.get(key, 0) < self.max_connections_per_host:
+                    self.active[key] = self.active.get(key, 0) + 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise socket.timeout('timed out waiting for a pooled connection to ' + key[1])
+                self.condition.wait(remaining)
+        try:
+            return self.create_connection(key, timeout), False
+        except Exception:
+            self.release(key, None)
+            raise
+
+    def release(self, key, connection, reusable=True):
+        with self.condition:
+            self.active[key] -= 1
+            if not self.active[key]:
+                del self.active[key]
+            if connection is not None:
+                if reusable:
+                    self.idle.setdefault(key, []).append((connection, monotonic()))
+                else:
+                    connection.close()
+            self.condition.notify()
+
+    @staticmethod
+    def is_stale(connection):
+        """An idle keep-alive socket is readable only if the server closed it or sent garbage"""
+        try:
+            readable, writable, errored = select.select([connection.sock], [], [], 0)
+        except (select.error, ValueError):
+            return True
+        return bool(readable)
+
+    def write(self, connection, request, timeout):
+        connection.timeout = timeout
+        if connection.sock is not None and self.is_stale(connection):
+            # nothing has been sent yet, reconnect instead of writing into a closed socket
+            connection.close()
+        if connection.sock is None:
+            connection.connect()
+            # headers and body go out in separate writes, don't let Nagle delay the body
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            connection.sock.settimeout(timeout)
+        parsed = _urlparse.urlsplit(request.get_full_url())
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        headers = dict(request.header_items())
+        connection.request(request.get_method(), path, request.data, headers)
+
+    def read(self, connection):
+        response = connection.getresponse()
+        body = response.read()
+        return response, body
+
+    def open(self, request, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+        url = request.get_full_url()
+        key = self.key(url)
+        connection, reused = self.acquire(key, timeout)
+        try:
+            try:
+                self.write(connection, request, timeout)
+            except (httplib.HTTPException, socket.error) as e:
+                # a keep-alive connection may have been reset by the server while idle, the request
+                # did not get through, so it goes once more on a fresh connection unless it timed out
+                if not reused or isinstance(e, socket.timeout):
+                    raise
+                connection.close()
+                connection = self.create_connection(key, timeout)
+                self.write(connection, request, timeout)
+            response, body = self.read(connection)
+        except (socket.timeout, httplib.HTTPException):
+            self.release(key, connection, False)
+            raise
+        except socket.error as e:
+            self.release(key, connection, False)
+            raise _urllib.URLError(e)
+        except Exception:
+            self.release(key, connection, False)
+            raise
+        self.release(key, connection, not response.will_close)
+        headers = response.msg
+        if not (200 <= response.status < 300):
+            raise _urllib.HTTPError(url, response.status, response.reason, headers, io.BytesIO(body))
+        return _urllib.addinfourl(io.BytesIO(body), headers, url, response.status)
+
+    def close(self):
+        with self.condition:
+            for key in list(self.idle.keys()):
+                for connection, timestamp in self.idle[key]:
+                    connection.close()
+            self.idle = {}
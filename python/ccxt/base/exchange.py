@@ -8,12 +8,32 @@ __version__ = '1.10.387'
 
 # -----------------------------------------------------------------------------
 
+from ccxt.base.errors import BaseError
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import NotSupported
 from ccxt.base.errors import AuthenticationError
 from ccxt.base.errors import DDoSProtection
 from ccxt.base.errors import RequestTimeout
 from ccxt.base.errors import ExchangeNotAvailable
+from ccxt.base.errors import InvalidNonce
+from ccxt.base.errors import NetworkError
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.circuit_breaker import CircuitBreaker
+from ccxt.base.connection_pool import ConnectionPool
+from ccxt.base.json_backend import json_loads
+from ccxt.base.nonce_manager import NonceManager
+from ccxt.base.ohlcv_columns import ohlcv_columns
+from ccxt.base.ohlcv_columns import ohlcv_fields
+from ccxt.base.order_book_array import aggregate_array
+from ccxt.base.order_book_array import bids_asks_array
+from ccxt.base.response_cache import ResponseCache
+from ccxt.base.response_state import ResponseState
+from ccxt.base.response_state import ThreadLocalResponseState
+from ccxt.base.response_state import response_state_property
+from ccxt.base.throttle import shared_throttle
+from ccxt.base.throttle import throttle
 
 # -----------------------------------------------------------------------------
 
@@ -27,6 +47,7 @@ __all__ = [
 import base64
 import calendar
 import collections
+import copy
 import datetime
 import functools
 import gzip
@@ -35,14 +56,19 @@ import hmac
 import io
 import json
 import math
+import os
+import random
 import re
 import socket
 import ssl
 # import sys
+import tempfile
+import threading
 import time
 import uuid
 import zlib
 import decimal
+import email.utils
 
 # -----------------------------------------------------------------------------
 
@@ -62,6 +88,63 @@ try:
 except NameError:
     basestring = str  # Python 2
 
+try:
+    replace_file = os.replace  # Python 3.3+
+except AttributeError:
+    replace_file = os.rename   # atomic on POSIX
+
+# -----------------------------------------------------------------------------
+
+
+class ImplicitApiMethod(object):
+    """An implicit method defined on an exchange class from its own api
+
+    Subclasses define their implicit methods from their own api, so the
+    methods of a parent class are hidden from them, otherwise the endpoints
+    of bitfinex would show up on bitfinex2 once bitfinex was instantiated"""
+
+    def __init__(self, owner, method_name, path, api, method, name):
+        def request(self, *args, **kwargs):
+            return getattr(self, method_name)(path, api, method, *args, **kwargs)
+        request.__name__ = name
+        request.__qualname__ = name
+        self.owner = owner
+        self.name = name
+        self.function = request
+
+    def __get__(self, instance, owner):
+        if owner is not self.owner:
+            raise AttributeError("'" + owner.__name__ + "' object has no attribute '" + self.name + "'")
+        return self.function.__get__(instance, owner)
+
+# -----------------------------------------------------------------------------
+
+
+class ReadOnlyDict(dict):
+    """A dict shared by all instances of an exchange class"""
+
+    def readonly(self, *args, **kwargs):
+        raise TypeError('this dict is shared by all instances of the exchange class, pass your changes to the exchange constructor instead')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    @staticmethod
+    def freeze(value):
+        if isinstance(value, dict):
+            return ReadOnlyDict((key, ReadOnlyDict.freeze(value[key])) for key in value)
+        if isinstance(value, list):
+            return tuple(ReadOnlyDict.freeze(item) for item in value)
+        return value
+
 # -----------------------------------------------------------------------------
 
 
@@ -73,10 +156,32 @@ class Exchange(object):
     # rate limiter settings
     enableRateLimit = False
     rateLimit = 2000  # milliseconds = seconds * 1000
+    adaptiveRateLimit = False  # speed up while responses are healthy, slow down on DDoSProtection
+    rateLimitFile = None       # path of a file to share the token buckets with other processes
+    throttlePriorities = {}    # async only, lane by implicit method or api group name
+    retryPolicy = {
+        'maxRetries': 0,     # retries of a failed call in fetch2, 0 lets every error through
+        'baseDelay': 500,    # milliseconds, the backoff doubles on every attempt
+        'maxDelay': 10000,   # milliseconds
+        'deadline': 30000,   # milliseconds for all the attempts of a call together
+        'idempotent': [],    # signed implicit methods that are safe to repeat, unsigned calls always are
+    }
+    circuitBreaker = {
+        'failureThreshold': 0,  # consecutive network failures that open the breaker, 0 disables it
+        'resetTimeout': 30000,  # milliseconds to fail fast before probing again
+        'halfOpenProbes': 1,
+        'scope': 'api',         # a breaker per api group, or 'exchange' for one breaker
+    }
     timeout = 10000   # milliseconds = seconds * 1000
     asyncio_loop = None
     aiohttp_session = None
     aiohttp_proxy = None
+    shareSession = False   # async only, use one aiohttp session for all exchanges in the process
+    session_manager = None
+    keepAlive = False
+    connection_pool = None
+    marketsCacheDirectory = None  # set to a path to persist markets between runs
+    marketsCacheTTL = 3600000     # milliseconds = seconds * 1000
     userAgent = None
     userAgents = {
         'chrome': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/62.0.3202.94 Safari/537.36',
@@ -92,6 +197,15 @@ class Exchange(object):
     tickers = None
     api = None
     parseJsonResponse = True
+    publicApis = ['public']   # implicit api groups that are called unsigned
+    coalesceRequests = False  # async only, merge identical concurrent GETs to the publicApis
+    cacheResponses = False    # keep the responses of GETs to the publicApis in memory
+    responseCacheTTL = {      # implicit method name → milliseconds, 'default' for the others
+        'default': 1000,
+    }
+    responseCacheSize = 16 * 1024 * 1024  # bytes
+    response_cache = None
+    jsonBackend = 'json'  # 'orjson', 'ujson', 'rapidjson' or 'auto' for the fastest installed
     headers = {}
     balance = {}
     orderbooks = {}
@@ -99,6 +213,8 @@ class Exchange(object):
     trades = {}
     currencies = {}
     proxy = ''
+    monotonicNonce = False  # nonces strictly increase per apiKey across threads, coroutines and instances
+    nonceFile = None        # path that keeps the last nonce of every apiKey for other processes and restarts
     apiKey = ''
     secret = ''
     password = ''
@@ -159,60 +275,147 @@ class Exchange(object):
     }
 
     substituteCommonCurrencyCodes = True
+    orderBookFormat = 'list'  # or 'numpy' for bids and asks as float64 arrays of shape (n, 2)
+    ohlcvFormat = 'list'      # or 'array' or 'numpy' for one column per field instead of a list per candle
+    ohlcvLimit = None         # candles per fetch_ohlcv call in fetch_ohlcv_range, ohlcv_limits[id] by default
+    ohlcv_limits = {
+        'binance': 500,
+        'bitfinex2': 1000,
+        'bitmex': 500,
+        'gdax': 300,
+        'kraken': 720,  # only the last 720 candles of a timeframe are served
+        'poloniex': 1000,
+    }
+    ohlcvRangeConcurrency = 8  # async only, windows of fetch_ohlcv_range in flight at once
     lastRestRequestTimestamp = 0
     lastRestPollTimestamp = 0
     restRequestQueue = None
     restPollerLoopIsRunning = False
+    tokenBucket = None   # settings of the default bucket, derived from the rateLimit
+    tokenBuckets = {}    # name → settings of additional buckets, each api group goes to the bucket of its name if there is one
+    rate_limit_rates = ('refillRate', 'minRefillRate', 'maxRefillRate', 'additiveIncrease')
+    hmac_prototypes = None     # (secret, algorithm) → keyed hmac object, per instance
+    hmacPrototypesSize = 8
     rateLimitTokens = 16
     rateLimitMaxTokens = 16
     rateLimitUpdateTime = 0
-    last_http_response = None
-    last_json_response = None
+    threadSafe = False    # keeps the details of the last response per thread, to share an instance between threads
+    response_state = None
+    http_response_body = response_state_property('http_response_body')
+    last_json_response = response_state_property('last_json_response')
+    last_http_status_code = response_state_property('last_http_status_code')
+    last_response_headers = response_state_property('last_response_headers')
+    api_endpoints = None
+    camelcase_aliases = None
+    shared_description = None
 
     def __init__(self, config={}):
 
+        self.response_state = ResponseState()
+
         # version = '.'.join(map(str, sys.version_info[:3]))
         # self.userAgent = {
         #     'User-Agent': 'ccxt/' + __version__ + ' (+https://github.com/ccxt/ccxt) Python/' + version
         # }
 
-        settings = self.deep_extend(self.describe(), config)
+        description = self.describe_class()
 
-        for key in settings:
-            if hasattr(self, key) and isinstance(getattr(self, key), dict):
-                setattr(self, key, self.deep_extend(getattr(self, key), settings[key]))
-            else:
-                setattr(self, key, settings[key])
+        for key in description:
+            if key not in config:
+                value = description[key]
+                # a shallow copy keeps top-level overrides like exchange.urls['api'] = ... private
+                if isinstance(value, dict):
+                    value = dict(value)
+                elif isinstance(value, tuple):
+                    value = list(value)
+                setattr(self, key, value)
+
+        for key in config:
+            base = description[key] if key in description else getattr(self, key, None)
+            setattr(self, key, self.deep_extend(base if isinstance(base, dict) else None, config[key]))
+
+        if self.keepAlive and not self.connection_pool:
+            self.connection_pool = ConnectionPool()
+
+        if self.cacheResponses and not self.response_cache:
+            self.response_cache = ResponseCache(self.responseCacheSize)
 
         if self.api:
-            self.define_rest_api(self.api, 'request')
+            if 'api' in config:
+                self.define_rest_api(self.api, 'request')
+            else:
+                self.define_class_rest_api(self.api, 'request')
 
         if self.markets:
             self.set_markets(self.markets)
 
-        # format camel case
-        for attr in dir(self):
-            if attr[0] != '_'and attr[-1] != '_' and '_' in attr:
-                conv = attr.split('_')
-                camel_case = conv[0] + ''.join(i[0].upper() + i[1:] for i in conv[1:])
-                setattr(self, camel_case, getattr(self, attr))
+        self.define_camelcase_aliases()
 
-        self.tokenBucket = {
+        if self.threadSafe:
+            self.response_state = ThreadLocalResponseState()
+
+        if self.monotonicNonce or self.nonceFile:
+            self.nonce = functools.partial(self.issue_nonce, self.nonce)
+
+        # the keyed prototypes live and die with the instance that holds the secret
+        self.hmac_prototypes = {}
+        self.hmac = self.keyed_hmac
+
+        self.in_flight = {}
+        self.in_flight_lock = threading.Lock()
+        self.circuit_breakers = {}
+
+        # the rates that are not set explicitly follow the rateLimit, see rescale_token_buckets
+        self.rate_limit_fields = [field for field in self.rate_limit_rates if field not in (self.tokenBucket or {})]
+        self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit,
-            'delay': 1.0,
             'capacity': 1.0,
             'defaultCost': 1.0,
             'maxCapacity': 1000,
-        }
+            # adaptiveRateLimit settings
+            'minRefillRate': 0.1 / self.rateLimit,
+            'maxRefillRate': 2.0 / self.rateLimit,
+            'additiveIncrease': 0.02 / self.rateLimit,  # per healthy response
+            'multiplicativeDecrease': 0.5,
+            'decreaseInterval': 1000,  # milliseconds, one cut per burst of rejected requests
+        }, self.tokenBucket or {})
+
+        self.init_rest_rate_limiter()
 
     def describe(self):
         return {}
 
-    def define_rest_api(self, api, method_name, options={}):
+    def describe_class(self):
+        """Returns describe() merged over the class defaults, computed once per class
+
+        The nested structures of the result are shared by all instances of the
+        class and are read-only, dicts are ReadOnlyDict and lists are tuples,
+        settings passed to the constructor are merged into private copies"""
+        cls = type(self)
+        if cls.__dict__.get('shared_description') is None:
+            description = {}
+            for key, value in self.describe().items():
+                default = getattr(cls, key, None)
+                description[key] = self.deep_extend(default if isinstance(default, dict) else None, value)
+            cls.shared_description = ReadOnlyDict.freeze(description)
+        return cls.shared_description
+
+    @staticmethod
+    def implicit_api_endpoints(api, options={}):
+        """Returns the implicit method names of every endpoint in an api definition
+
+        The paths of a method are either a list or a dict of path → rate limit
+        cost, or path → {'cost': cost, 'bucket': name of a tokenBuckets entry,
+        'priority': name of a throttle lane, 'idempotent': True if a signed call
+        is safe to repeat}"""
         delimiters = re.compile('[^a-zA-Z0-9]')
+        endpoints = []
         for api_type, methods in api.items():
             for http_method, urls in methods.items():
                 for url in urls:
+                    limits = urls[url] if isinstance(urls, dict) else None
+                    if not isinstance(limits, dict):
+                        limits = {'cost': limits}
                     url = url.strip()
                     split_path = delimiters.split(url)
 
@@ -238,9 +441,80 @@ class Exchange(object):
                         if 'underscore' in options['suffixes']:
                             underscore += options['suffixes']['underscore']
 
-                    partial = functools.partial(getattr(self, method_name), url, api_type, uppercase_method)
-                    setattr(self, camelcase, partial)
-                    setattr(self, underscore, partial)
+                    endpoints.append({
+                        'path': url,
+                        'api': api_type,
+                        'method': uppercase_method,
+                        'camelcase': camelcase,
+                        'underscore': underscore,
+                        'cost': limits.get('cost'),
+                        'bucket': limits.get('bucket'),
+                        'priority': limits.get('priority'),
+                        'idempotent': bool(limits.get('idempotent')),
+                    })
+        return endpoints
+
+    def define_rest_api(self, api, method_name, options={}):
+        """Defines implicit methods on this instance only, see define_class_rest_api"""
+        endpoints = self.implicit_api_endpoints(api, options)
+        for endpoint in endpoints:
+            partial = functools.partial(getattr(self, method_name), endpoint['path'], endpoint['api'], endpoint['method'])
+            setattr(self, endpoint['camelcase'], partial)
+            setattr(self, endpoint['underscore'], partial)
+            setattr(self, self.camelcase(endpoint['underscore']), partial)
+        self.api_endpoints = self.index_api_endpoints(endpoints)
+
+    @classmethod
+    def define_class_rest_api(cls, api, method_name, options={}):
+        """Defines implicit methods once per class, they are shared by all of its instances"""
+        if cls.__dict__.get('api_endpoints') is not None:
+            return
+        endpoints = cls.implicit_api_endpoints(api, options)
+        for endpoint in endpoints:
+            method = ImplicitApiMethod(cls, method_name, endpoint['path'], endpoint['api'], endpoint['method'], endpoint['camelcase'])
+            for name in (endpoint['camelcase'], endpoint['underscore']):
+                # a method written in the class body takes precedence over the implicit one
+                if not cls.defines_method(name):
+                    setattr(cls, name, method)
+        cls.api_endpoints = cls.index_api_endpoints(endpoints)
+
+    @classmethod
+    def define_camelcase_aliases(cls):
+        """Aliases every snake_case method with its camelCase name, once per class"""
+        if cls.__dict__.get('camelcase_aliases') is not None:
+            return
+        aliases = {}
+        for attr in dir(cls):
+            # implicit methods of a parent class are hidden, getattr raises for them
+            if attr[0] != '_' and attr[-1] != '_' and '_' in attr and callable(getattr(cls, attr, None)):
+                camel_case = cls.camelcase(attr)
+                existing = getattr(cls, camel_case, None)
+                # keep methods written in the class body and config options like circuitBreaker
+                if cls.defines_method(camel_case) or (existing is not None and not callable(existing)):
+                    continue
+                # take the raw function, staticmethod or classmethod from the class that defines it
+                value = next(klass.__dict__[attr] for klass in cls.__mro__ if attr in klass.__dict__)
+                setattr(cls, camel_case, value)
+                aliases[camel_case] = attr
+        cls.camelcase_aliases = aliases
+
+    @classmethod
+    def defines_method(cls, name):
+        """Tells whether the class body itself defines name, as opposed to inheriting it or to an alias"""
+        value = cls.__dict__.get(name)
+        if value is None or isinstance(value, ImplicitApiMethod):
+            return False
+        aliases = cls.__dict__.get('camelcase_aliases')
+        return not (aliases and name in aliases)
+
+    @staticmethod
+    def camelcase(string):
+        conv = string.split('_')
+        return conv[0] + ''.join(i[:1].upper() + i[1:] for i in conv[1:])
+
+    @staticmethod
+    def index_api_endpoints(endpoints):
+        return dict([((endpoint['api'], endpoint['method'], endpoint['path']), endpoint) for endpoint in endpoints])
 
     def raise_error(self, exception_type, url, method='GET', error=None, details=None):
         details = details if details else ''
@@ -266,20 +540,269 @@ class Exchange(object):
         else:
             raise exception_type(' '.join([self.id, method, url, details]))
 
-    def throttle(self):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        if elapsed < self.rateLimit:
-            delay = self.rateLimit - elapsed
-            time.sleep(delay / 1000.0)
+    def init_rest_rate_limiter(self):
+        if self.rateLimitFile:
+            self.throttles = self.create_token_buckets(shared_throttle, {'file': self.rateLimitFile})
+        else:
+            self.throttles = self.create_token_buckets(throttle)
+        self.throttle = self.throttles['default']
+
+    def create_token_buckets(self, factory, config={}):
+        """Returns the default bucket and the tokenBuckets by name, the latter extend the settings of the former
+
+        A shared bucket is keyed by the exchange id, or by the 'key' of the tokenBucket so that processes
+        trading with different accounts can keep apart, followed by the bucket name. A tokenBuckets entry
+        with a 'key' of its own uses it as is."""
+        prefix = self.tokenBucket.get('key', str(self.id))
+        buckets = {}
+        for name, bucket in [('default', {})] + list(self.tokenBuckets.items()):
+            settings = self.extend(config, self.tokenBucket, {'key': prefix + ':' + name}, bucket)
+            buckets[name] = factory(settings)
+            buckets[name].rate_limit_fields = [field for field in self.rate_limit_fields if field not in bucket]
+        self.token_buckets_rate_limit = self.rateLimit
+        return buckets
+
+    def rescale_token_buckets(self):
+        """Scales the rates of the buckets that derive from the rateLimit after it was changed"""
+        scale = float(self.token_buckets_rate_limit) / self.rateLimit
+        for field in self.rate_limit_fields:
+            self.tokenBucket[field] *= scale
+        for bucket in self.throttles.values():
+            for field in bucket.rate_limit_fields:
+                bucket.cfg[field] *= scale
+        self.token_buckets_rate_limit = self.rateLimit
+
+    def endpoint_throttle(self, path, api='public', method='GET'):
+        """Returns the bucket and the cost of an implicit api call, a cost of None stands for the defaultCost"""
+        if self.rateLimit != self.token_buckets_rate_limit:
+            self.rescale_token_buckets()
+        endpoint = self.api_endpoints.get((api, method, path)) if self.api_endpoints else None
+        bucket = endpoint['bucket'] if endpoint else None
+        if bucket is None:
+            bucket = api
+        cost = endpoint['cost'] if endpoint else None
+        return self.throttles.get(bucket, self.throttle), cost
 
     def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """A better wrapper over request for deferred signing"""
-        if self.enableRateLimit:
-            self.throttle()
+        if not self.retryPolicy['maxRetries']:
+            return self.fetch_once(path, api, method, params, headers, body)
+        deadline = self.milliseconds() + self.retryPolicy['deadline']
+        attempt = 0
+        while True:
+            try:
+                # every attempt is signed anew, with a fresh nonce
+                return self.fetch_once(path, api, method, params, headers, body)
+            except BaseError as e:
+                delay = self.retry_delay(e, attempt, deadline, path, api, method)
+                if delay is None:
+                    raise
+            time.sleep(delay / 1000.0)
+            attempt += 1
+
+    def retry_delay(self, error, attempt, deadline, path, api='public', method='GET'):
+        """Returns how many milliseconds to wait before the next attempt of a failed call, None to give up"""
+        policy = self.retryPolicy
+        if (attempt >= policy['maxRetries']) or not self.is_retryable(error, path, api, method):
+            return None
+        breaker = self.api_circuit_breaker(api)
+        if breaker and (breaker.state == CircuitBreaker.OPEN):
+            return None
+        # full jitter spreads out the retries of concurrent callers
+        delay = random.uniform(0, min(policy['maxDelay'], policy['baseDelay'] * 2 ** attempt))
+        if isinstance(error, DDoSProtection):
+            delay = max(delay, self.retry_after(error) or 0)
+        if self.milliseconds() + delay >= deadline:
+            return None
+        return delay
+
+    def is_retryable(self, error, path, api='public', method='GET'):
+        """Tells if a call can be repeated after an error without risking to execute it twice
+
+        Some exchanges place orders and withdraw over signed GETs, so the HTTP
+        method tells nothing, a signed call is only repeated if its endpoint is
+        listed in retryPolicy['idempotent'] or marked idempotent in the api"""
+        if not isinstance(error, (NetworkError, InvalidNonce)):
+            return False
+        return self.is_idempotent(path, api, method)
+
+    def is_idempotent(self, path, api='public', method='GET'):
+        if api in self.publicApis:
+            return True
+        endpoint = self.api_endpoints.get((api, method, path)) if self.api_endpoints else None
+        if not endpoint:
+            return False
+        idempotent = self.retryPolicy['idempotent']
+        return endpoint['idempotent'] or (endpoint['camelcase'] in idempotent) or (endpoint['underscore'] in idempotent)
+
+    def fetch_once(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        breaker = self.api_circuit_breaker(api)
+        if not breaker:
+            return self.send_request(path, api, method, params, headers, body)
+        if not breaker.allow():
+            raise self.circuit_open_error(breaker, path, method)
+        # an interrupted or rate limited call neither proves nor disproves the health of the exchange
+        outcome = breaker.release
+        try:
+            response = self.send_request(path, api, method, params, headers, body)
+            outcome = breaker.success
+            return response
+        except DDoSProtection:
+            raise
+        except Exception as e:
+            outcome = breaker.failure if self.is_circuit_failure(e) else breaker.success
+            raise
+        finally:
+            outcome()
+
+    @staticmethod
+    def is_circuit_failure(error):
+        """Tells if an error counts against a circuit breaker: timeouts, transport errors and 5xx responses
+
+        Other errors, 4xx responses mapped to ExchangeNotAvailable included, mean the exchange did reply.
+        The async fetch raises an ExchangeError marked as unreachable when it cannot connect."""
+        if isinstance(error, RequestTimeout) or getattr(error, 'unreachable', False):
+            return True
+        http_status_code = getattr(error, 'http_status_code', None)
+        if http_status_code is not None:
+            return http_status_code >= 500
+        return isinstance(error, NetworkError)
+
+    def api_circuit_breaker(self, api='public'):
+        """Returns the circuit breaker of an api group, None when they are disabled"""
+        settings = self.circuitBreaker
+        if not settings['failureThreshold']:
+            return None
+        key = 'exchange' if settings['scope'] == 'exchange' else api
+        breaker = self.circuit_breakers.get(key)
+        if breaker is None:
+            breaker = self.circuit_breakers.setdefault(key, CircuitBreaker(settings['failureThreshold'], settings['resetTimeout'], settings['halfOpenProbes']))
+        return breaker
+
+    def circuit_breaker_status(self):
+        """Returns the state of every circuit breaker by api group, or under 'exchange'"""
+        return dict((key, breaker.status()) for key, breaker in self.circuit_breakers.items())
+
+    def circuit_open_error(self, breaker, path, method='GET'):
+        return ExchangeNotAvailable(' '.join([self.id, method, path, 'circuit breaker open after', str(breaker.failures), 'failures, retry in', str(breaker.retry_in()), 'ms']))
+
+    def send_request(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        throttle, cost = self.endpoint_throttle(path, api, method) if self.enableRateLimit else (None, None)
+        if 'throttlePriority' in params:
+            # there are no lanes in the sync throttle, the param is not sent either way
+            params = self.omit(params, 'throttlePriority')
+        ttl = self.response_cache_ttl(path, api, method)
+        if ttl:
+            request = self.sign(path, api, method, params, headers, body)
+            cached = self.response_cache.get(self.request_key(request))
+            if cached is not None:
+                return self.handle_rest_response(cached, request['url'], request['method'], request['headers'], request['body'])
+            return self.fetch_signed(request, throttle, cost, ttl)
+        if throttle:
+            throttle(cost)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        return self.fetch_request(request, throttle)
+
+    def fetch_signed(self, request, throttle=None, cost=None, ttl=None):
+        if throttle:
+            throttle(cost)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        response = self.fetch_request(request, throttle)
+        if ttl:
+            self.response_cache.set(self.request_key(request), self.http_response_body, ttl)
+        return response
+
+    def request_priority(self, path, api='public', method='GET', params={}):
+        """Returns the throttle lane of an implicit api call
+
+        The lane is the throttlePriority param of the call, which unified methods pass through, e.g.
+        fetch_balance({'throttlePriority': 'create'}). Otherwise it is looked up in the endpoint
+        definition, then in throttlePriorities by implicit method name and by api group. Without any
+        of those cancels go first, then other private writes, private reads and public calls last."""
+        if params.get('throttlePriority'):
+            return params['throttlePriority']
+        priorities = self.throttlePriorities
+        endpoint = self.api_endpoints.get((api, method, path)) if self.api_endpoints else None
+        name = endpoint['camelcase'] if endpoint else path
+        if endpoint:
+            if endpoint['priority']:
+                return endpoint['priority']
+            for implicit_method in (endpoint['camelcase'], endpoint['underscore']):
+                if implicit_method in priorities:
+                    return priorities[implicit_method]
+        if api in priorities:
+            return priorities[api]
+        if (method == 'DELETE') or (name.lower().find('cancel') >= 0):
+            return 'cancel'
+        if api in self.publicApis:
+            return 'public'
+        return 'private' if method == 'GET' else 'create'
+
+    def fetch_request(self, request, throttle=None):
+        if not (throttle and self.adaptiveRateLimit):
+            return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        try:
+            response = self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        except (DDoSProtection, ExchangeNotAvailable) as e:
+            self.slow_down(throttle, e)
+            raise
+        self.speed_up(throttle)
+        return response
+
+    def speed_up(self, throttle):
+        """Adds to the refill rate of a bucket after a healthy response"""
+        cfg = throttle.cfg
+        cfg['refillRate'] = min(cfg['maxRefillRate'], cfg['refillRate'] + cfg['additiveIncrease'])
+
+    def slow_down(self, throttle, error):
+        """Cuts the refill rate of a bucket after a rejected request and honours the Retry-After header"""
+        # the status of the response that raised the error, last_http_status_code may be older than a timeout
+        if not isinstance(error, DDoSProtection) and (getattr(error, 'http_status_code', None) not in [429, 503]):
+            return
+        cfg = throttle.cfg
+        now = self.milliseconds()
+        if now - cfg.get('lastDecrease', 0) >= cfg['decreaseInterval']:
+            cfg['lastDecrease'] = now
+            cfg['refillRate'] = max(cfg['minRefillRate'], cfg['refillRate'] * cfg['multiplicativeDecrease'])
+        retry_after = self.retry_after(error)
+        if retry_after:
+            throttle.pause(retry_after)
+
+    def retry_after(self, error):
+        """Returns the Retry-After of the response that raised error in milliseconds, it is either seconds or an HTTP date"""
+        headers = getattr(error, 'response_headers', None)
+        value = headers.get('Retry-After') if headers else None
+        if not value:
+            return None
+        try:
+            return max(float(value) * 1000, 0)
+        except ValueError:
+            date = email.utils.parsedate_tz(value)
+            if date is None:
+                return None
+            return max(email.utils.mktime_tz(date) * 1000 - self.milliseconds(), 0)
+
+    def effective_rate_limit(self, bucket='default'):
+        """Returns the current number of milliseconds between calls of defaultCost, which the adaptiveRateLimit moves"""
+        cfg = self.throttles[bucket].cfg
+        return cfg['defaultCost'] / cfg['refillRate']
+
+    def response_cache_ttl(self, path, api='public', method='GET'):
+        """Returns for how many milliseconds the response of an implicit api call is cached, if at all"""
+        if not self.response_cache or (method != 'GET') or (api not in self.publicApis):
+            return None
+        ttls = self.responseCacheTTL
+        endpoint = self.api_endpoints.get((api, method, path)) if self.api_endpoints else None
+        if endpoint:
+            for name in (endpoint['camelcase'], endpoint['underscore']):
+                if name in ttls:
+                    return ttls[name]
+        return ttls.get('default')
+
+    @staticmethod
+    def request_key(request):
+        return (request['method'], request['url'], request['body'])
 
     def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
         return self.fetch2(path, api, method, params, headers, body)
@@ -304,7 +827,7 @@ class Exchange(object):
         if self.userAgent:
             if type(self.userAgent) is str:
                 headers.update({'User-Agent': self.userAgent})
-            elif (type(self.userAgent) is dict) and ('User-Agent' in self.userAgent):
+            elif isinstance(self.userAgent, dict) and ('User-Agent' in self.userAgent):
                 headers.update(self.userAgent)
         if self.proxy:
             headers.update({'Origin': '*'})
@@ -319,34 +842,73 @@ class Exchange(object):
         response = None
         text = None
         try:  # send request and load response
-            handler = _urllib.HTTPHandler if url.startswith('http://') else _urllib.HTTPSHandler
-            opener = _urllib.build_opener(handler)
+            if self.connection_pool:
+                opener = self.connection_pool
+            else:
+                handler = _urllib.HTTPHandler if url.startswith('http://') else _urllib.HTTPSHandler
+                opener = _urllib.build_opener(handler)
             response = opener.open(request, timeout=int(self.timeout / 1000))
+            self.last_http_status_code = response.getcode()
+            self.last_response_headers = response.info()
             text = response.read()
             text = self.gzip_deflate(response, text)
-            text = text.decode('utf-8')
-            self.last_http_response = text
         except socket.timeout as e:
             raise RequestTimeout(' '.join([self.id, method, url, 'request timeout']))
         except ssl.SSLError as e:
             self.raise_error(ExchangeNotAvailable, url, method, e)
         except _urllib.HTTPError as e:
+            self.last_http_status_code = e.code
+            self.last_response_headers = e.info()
             message = self.gzip_deflate(e, e.read())
             try:
                 message = message.decode('utf-8')
             except UnicodeError:
                 pass
-            self.handle_errors(e.code, e.reason, url, method, None, message if message else text)
-            self.handle_rest_errors(e, e.code, message if message else text, url, method)
-            self.raise_error(ExchangeError, url, method, e, message if message else text)
+            try:
+                self.handle_errors(e.code, e.reason, url, method, None, message if message else text)
+                self.handle_rest_errors(e, e.code, message if message else text, url, method)
+                self.raise_error(ExchangeError, url, method, e, message if message else text)
+            except BaseError as error:
+                self.annotate_error(error, e.code, e.info())
+                raise
         except _urllib.URLError as e:
             self.raise_error(ExchangeNotAvailable, url, method, e)
         except httplib.BadStatusLine as e:
             self.raise_error(ExchangeNotAvailable, url, method, e)
         if self.verbose:
-            print(method, url, "\nResponse:", str(response.info()), text)
+            print(method, url, "\nResponse:", str(response.info()), self.decode_response(text))
         return self.handle_rest_response(text, url, method, headers, body)
 
+    @staticmethod
+    def annotate_error(error, http_status_code, response_headers):
+        """Attaches the status and headers of the HTTP response that an error was raised for"""
+        if getattr(error, 'http_status_code', None) is None:
+            error.http_status_code = http_status_code
+            error.response_headers = response_headers
+        return error
+
+    @staticmethod
+    def decode_response(response, charset=None):
+        """Returns the text of a raw body, a str on Python 3 and a unicode on Python 2 like the baseline fetch"""
+        if isinstance(response, bytes):
+            try:
+                return response.decode(charset or 'utf-8')
+            except (LookupError, UnicodeDecodeError):
+                # an unknown charset or a body that doesn't match the declared one
+                return response.decode('utf-8', 'replace')
+        return response
+
+    @property
+    def last_http_response(self):
+        body = self.http_response_body
+        if isinstance(body, bytes):
+            body = self.http_response_body = self.decode_response(body)
+        return body
+
+    @last_http_response.setter
+    def last_http_response(self, body):
+        self.http_response_body = body
+
     def handle_rest_errors(self, exception, http_status_code, response, url, method='GET'):
         error = None
         if http_status_code == 429:
@@ -368,13 +930,16 @@ class Exchange(object):
             self.raise_error(error, url, method, exception if exception else http_status_code, response)
 
     def handle_rest_response(self, response, url, method='GET', headers=None, body=None):
+        # response is either a str or the raw bytes of the body, which the JSON backend parses as is
+        self.last_http_response = response
+        if not self.parseJsonResponse:
+            return self.decode_response(response)
+        loads = json_loads(self.jsonBackend)
         try:
-            if self.parseJsonResponse:
-                self.last_json_response = json.loads(response) if len(response) > 1 else None
-                return self.last_json_response
-            else:
-                return response
+            self.last_json_response = loads(response) if len(response) > 1 else None
+            return self.last_json_response
         except Exception as e:
+            response = self.decode_response(response)
             ddos_protection = re.search('(cloudflare|incapsula)', response, flags=re.IGNORECASE)
             exchange_not_available = re.search('(offline|busy|retry|wait|unavailable|maintain|maintenance|maintenancing)', response, flags=re.IGNORECASE)
             if ddos_protection:
@@ -473,7 +1038,7 @@ class Exchange(object):
     @staticmethod
     def group_by(array, key):
         result = {}
-        if type(array) is dict:
+        if isinstance(array, dict):
             array = list(Exchange.keysort(array).items())
         array = [entry for entry in array if (key in entry) and (entry[key] is not None)]
         for entry in array:
@@ -489,7 +1054,7 @@ class Exchange(object):
     @staticmethod
     def index_by(array, key):
         result = {}
-        if type(array) is dict:
+        if isinstance(array, dict):
             array = list(Exchange.keysort(array).items())
         for element in array:
             if (key in element) and (element[key] is not None):
@@ -499,6 +1064,9 @@ class Exchange(object):
 
     @staticmethod
     def sort_by(array, key, descending=False):
+        if getattr(array, 'ndim', None) == 2:  # the numpy orderBookFormat
+            keys = -array[:, key] if descending else array[:, key]
+            return array[keys.argsort(kind='mergesort')]
         return sorted(array, key=lambda k: k[key], reverse=descending)
 
     @staticmethod
@@ -659,6 +1227,23 @@ class Exchange(object):
             return base64.b64encode(h.digest())
         return h.digest()
 
+    def keyed_hmac(self, request, secret, algorithm=hashlib.sha256, digest='hex'):
+        """Exchange.hmac of an instance, which copies a prototype keyed with the secret
+
+        Copying skips hashing the padded key into the inner and outer states on every request"""
+        prototype = self.hmac_prototypes.get((secret, algorithm))
+        if prototype is None:
+            if len(self.hmac_prototypes) >= self.hmacPrototypesSize:
+                self.hmac_prototypes.clear()  # the secret changes per request, e.g. derived from a nonce
+            prototype = self.hmac_prototypes[(secret, algorithm)] = hmac.new(secret, None, algorithm)
+        h = prototype.copy()
+        h.update(request)
+        if digest == 'hex':
+            return h.hexdigest()
+        elif digest == 'base64':
+            return base64.b64encode(h.digest())
+        return h.digest()
+
     @staticmethod
     def binary_concat(*args):
         result = bytes()
@@ -705,11 +1290,20 @@ class Exchange(object):
 
     @staticmethod
     def to_array(value):
-        return list(value.values()) if type(value) is dict else value
+        return list(value.values()) if isinstance(value, dict) else value
 
     def nonce(self):
         return Exchange.seconds()
 
+    def issue_nonce(self, nonce):
+        """Returns the result of nonce(), raised above the last nonce issued for the same exchange and apiKey
+
+        Only the sign() methods that call nonce() are covered. hitbtc2, luno, coinsecure, bitlish,
+        _1broker, okcoinusd and livecoin sign without a nonce, and huobipro signs an ISO 8601
+        timestamp the exchange checks against its own clock, which is not a counter to raise."""
+        key = hashlib.sha256(self.encode(str(self.id) + ':' + str(self.apiKey))).hexdigest()
+        return NonceManager.get(key, self.nonceFile).next(nonce())
+
     def check_required_credentials(self):
         keys = list(self.requiredCredentials.keys())
         for key in keys:
@@ -755,7 +1349,7 @@ class Exchange(object):
         return ('{:.' + str(self.markets[symbol]['precision']['price']) + 'f}').format(float(fee))
 
     def set_markets(self, markets, currencies=None):
-        values = list(markets.values()) if type(markets) is dict else markets
+        values = list(markets.values()) if isinstance(markets, dict) else markets
         for i in range(0, len(values)):
             values[i] = self.extend(
                 self.fees['trading'],
@@ -782,18 +1376,103 @@ class Exchange(object):
             self.currencies = self.deep_extend(self.index_by(currencies, 'code'), self.currencies)
         return self.markets
 
+    def single_flight(self, key, method, *args):
+        """Calls method(*args) once per key at a time, concurrent callers share its outcome"""
+        with self.in_flight_lock:
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = {'done': threading.Event()}
+        if not leader:
+            flight['done'].wait()
+            if 'error' in flight:
+                raise flight['error']
+            return flight['result']
+        try:
+            flight['result'] = method(*args)
+            return flight['result']
+        except Exception as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self.in_flight_lock:
+                del self.in_flight[key]
+            flight['done'].set()
+
     def load_markets(self, reload=False):
         if not reload:
             if self.markets:
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        # threads sharing this instance wait for a single load instead of each fetching the markets
+        return self.single_flight(('load_markets', reload), self.load_markets_helper, reload)
+
+    def load_markets_helper(self, reload=False):
+        if not reload:
+            if self.markets:
+                return self.markets
+            cached = self.load_markets_cache()
+            if cached:
+                return self.set_markets(cached['markets'], cached['currencies'])
         markets = self.fetch_markets()
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = self.fetch_currencies()
+        self.save_markets_cache(markets, currencies)
         return self.set_markets(markets, currencies)
 
+    def markets_cache_key(self):
+        # sandbox and testnet urls list other markets than production
+        api = json.dumps([self.urls.get('api'), getattr(self, 'hostname', None)], sort_keys=True)
+        return hashlib.sha256(api.encode('utf-8')).hexdigest()[0:16]
+
+    def markets_cache_path(self):
+        return os.path.join(self.marketsCacheDirectory, self.id + '-' + __version__ + '-' + self.markets_cache_key() + '.json')
+
+    def load_markets_cache(self):
+        """Returns the markets and currencies persisted by a previous run, unless expired"""
+        if not self.marketsCacheDirectory:
+            return None
+        try:
+            with io.open(self.markets_cache_path(), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if (cached.get('id') != self.id) or (cached.get('version') != __version__) or (cached.get('key') != self.markets_cache_key()):
+            return None
+        if self.marketsCacheTTL is not None:
+            if self.milliseconds() - cached.get('timestamp', 0) > self.marketsCacheTTL:
+                return None
+        return cached
+
+    def save_markets_cache(self, markets, currencies=None):
+        """Atomically replaces the persisted markets, the cache is best-effort and never raises"""
+        if not self.marketsCacheDirectory:
+            return
+        path = self.markets_cache_path()
+        try:
+            contents = json.dumps({
+                'id': self.id,
+                'version': __version__,
+                'key': self.markets_cache_key(),
+                'timestamp': self.milliseconds(),
+                'markets': markets,
+                'currencies': currencies,
+            })
+            if not os.path.isdir(self.marketsCacheDirectory):
+                os.makedirs(self.marketsCacheDirectory)
+            fd, temporary = tempfile.mkstemp(prefix='.' + self.id + '-', dir=self.marketsCacheDirectory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(contents.encode('utf-8'))
+                replace_file(temporary, path)
+            except Exception:
+                os.remove(temporary)
+                raise
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
     def fetch_markets(self):
         return self.markets
 
@@ -824,6 +1503,8 @@ class Exchange(object):
 
     def parse_ohlcvs(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
         ohlcvs = self.to_array(ohlcvs)
+        if self.ohlcvFormat != 'list':
+            return self.parse_ohlcv_columns(ohlcvs, market, timeframe, since, limit)
         num_ohlcvs = len(ohlcvs)
         result = []
         i = 0
@@ -843,8 +1524,22 @@ class Exchange(object):
     def parse_bids_asks(self, bidasks, price_key=0, amount_key=1):
         return [self.parse_bid_ask(bidask, price_key, amount_key) for bidask in bidasks]
 
+    def parse_bids_asks_array(self, bidasks, price_key=0, amount_key=1):
+        if (type(self).parse_bids_asks is Exchange.parse_bids_asks) and (type(self).parse_bid_ask is Exchange.parse_bid_ask):
+            return bids_asks_array(bidasks, price_key, amount_key)
+        # an exchange with a parser of its own
+        return bids_asks_array(self.parse_bids_asks(bidasks, price_key, amount_key))
+
     def fetch_l2_order_book(self, symbol, params={}):
         orderbook = self.fetch_order_book(symbol, params)
+        return self.aggregate_order_book(orderbook)
+
+    def aggregate_order_book(self, orderbook):
+        if (self.orderBookFormat == 'numpy') and not isinstance(orderbook['bids'], list):
+            return self.extend(orderbook, {
+                'bids': aggregate_array(orderbook['bids'], True),
+                'asks': aggregate_array(orderbook['asks']),
+            })
         return self.extend(orderbook, {
             'bids': self.sort_by(self.aggregate(orderbook['bids']), 0, True),
             'asks': self.sort_by(self.aggregate(orderbook['asks']), 0),
@@ -852,9 +1547,10 @@ class Exchange(object):
 
     def parse_order_book(self, orderbook, timestamp=None, bids_key='bids', asks_key='asks', price_key=0, amount_key=1):
         timestamp = timestamp or self.milliseconds()
+        parse_bids_asks = self.parse_bids_asks_array if self.orderBookFormat == 'numpy' else self.parse_bids_asks
         return {
-            'bids': self.parse_bids_asks(orderbook[bids_key], price_key, amount_key) if (bids_key in orderbook) and isinstance(orderbook[bids_key], list) else [],
-            'asks': self.parse_bids_asks(orderbook[asks_key], price_key, amount_key) if (asks_key in orderbook) and isinstance(orderbook[asks_key], list) else [],
+            'bids': parse_bids_asks(orderbook[bids_key] if (bids_key in orderbook) and isinstance(orderbook[bids_key], list) else [], price_key, amount_key),
+            'asks': parse_bids_asks(orderbook[asks_key] if (asks_key in orderbook) and isinstance(orderbook[asks_key], list) else [], price_key, amount_key),
             'timestamp': timestamp,
             'datetime': self.iso8601(timestamp),
         }
@@ -880,9 +1576,80 @@ class Exchange(object):
     def fetch_total_balance(self, params={}):
         return self.fetch_partial_balance('total', params)
 
+    def parse_ohlcv_columns(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
+        if type(self).parse_ohlcv is Exchange.parse_ohlcv:
+            candles = ohlcvs  # already in the unified order
+        else:
+            # each parsed candle is dropped as soon as its values are copied into the columns
+            candles = (self.parse_ohlcv(ohlcv, market, timeframe, since, limit) for ohlcv in ohlcvs)
+        return ohlcv_columns(candles, self.ohlcvFormat, since, limit)
+
     def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
         raise NotSupported(self.id + ' API does not allow to fetch OHLCV series for now')
 
+    def fetch_ohlcv_range(self, symbol, timeframe='1m', since=None, until=None, params={}):
+        """Fetches the candles from since to until in windows of ohlcvLimit candles, see merge_ohlcv_windows"""
+        windows = self.ohlcv_windows(timeframe, since, until)
+        results = [self.fetch_ohlcv(symbol, timeframe, start, limit, params) for start, limit in windows]
+        return self.merge_ohlcv_windows(results, timeframe, windows, until)
+
+    @staticmethod
+    def parse_timeframe(timeframe):
+        """Returns the duration of a timeframe like '1m', '4h' or '1M' in seconds"""
+        amount = int(timeframe[0:-1])
+        unit = timeframe[-1]
+        scales = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000, 'y': 31536000}
+        if unit not in scales:
+            raise NotSupported('timeframe unit ' + unit + ' is not supported')
+        return amount * scales[unit]
+
+    def ohlcv_windows(self, timeframe='1m', since=None, until=None):
+        """Returns the (since, limit) of every fetch_ohlcv call that covers since to until"""
+        duration = self.parse_timeframe(timeframe) * 1000
+        limit = self.ohlcvLimit or self.ohlcv_limits.get(self.id, 100)
+        until = until or self.milliseconds()
+        since = until - limit * duration if since is None else since
+        start = int(math.ceil(since / float(duration))) * duration  # the first candle at or after since
+        windows = []
+        while start < until:
+            windows.append((start, min(limit, int(math.ceil((until - start) / float(duration))))))
+            start += limit * duration
+        return windows
+
+    def merge_ohlcv_windows(self, results, timeframe, windows, until=None):
+        """Returns {'ohlcv': candles, 'gaps': [[from, to], ...]} of the results of fetch_ohlcv for windows
+
+        Candles outside their window are dropped, the ones in overlapping windows
+        are taken once by timestamp, and every span without candles inside the
+        range is reported as a gap, from its first missing timestamp to the next
+        candle, or to until."""
+        duration = self.parse_timeframe(timeframe) * 1000
+        candles = {}
+        for (start, limit), result in zip(windows, results):
+            if isinstance(result, dict):  # ohlcvFormat 'array' or 'numpy'
+                result = zip(*[result[field] for field in ohlcv_fields])
+            end = start + limit * duration
+            for ohlcv in result:
+                timestamp = int(ohlcv[0])
+                if (start <= timestamp < end) and (timestamp not in candles):
+                    candles[timestamp] = list(ohlcv)
+        ohlcvs = [candles[timestamp] for timestamp in sorted(candles.keys())]
+        gaps = []
+        expected = windows[0][0] if windows else None
+        for ohlcv in ohlcvs:
+            if ohlcv[0] > expected:
+                gaps.append([expected, ohlcv[0]])
+            expected = ohlcv[0] + duration
+        end = windows[-1][0] + windows[-1][1] * duration if windows else None
+        if (expected is not None) and (expected < end):
+            gaps.append([expected, end if until is None else min(end, until)])
+        if self.ohlcvFormat != 'list':
+            ohlcvs = ohlcv_columns(ohlcvs, self.ohlcvFormat)
+        return {
+            'ohlcv': ohlcvs,
+            'gaps': gaps,
+        }
+
     def parse_trades(self, trades, market=None, since=None, limit=None):
         array = self.to_array(trades)
         array = [self.parse_trade(trade, market) for trade in array]
@@ -927,7 +1694,7 @@ class Exchange(object):
 
     def market_id(self, symbol):
         market = self.market(symbol)
-        return market['id'] if type(market) is dict else symbol
+        return market['id'] if isinstance(market, dict) else symbol
 
     def calculate_fee(self, symbol, type, side, amount, price, taker_or_maker='taker', params={}):
         market = self.markets[symbol]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Interchangeable JSON decoders for REST responses"""
+
+# -----------------------------------------------------------------------------
+
+import importlib
+import json
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'json_backends',
+    'json_loads',
+]
+
+# -----------------------------------------------------------------------------
+
+
+def stdlib_loads(data):
+    if isinstance(data, bytes) and not isinstance(data, str):  # Python 3
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+# orjson, ujson and rapidjson parse utf-8 bytes directly, without an intermediate str
+# all of them raise a subclass of ValueError on malformed input, like the json module
+json_backends = {
+    'json': stdlib_loads,
+    'orjson': None,
+    'ujson': None,
+    'rapidjson': None,
+}
+
+# the order in which 'auto' picks the first installed backend
+auto_backends = ['orjson', 'rapidjson', 'ujson', 'json']
+
+loaders = {}
+
+
+def json_loads(backend='json'):
+    """Returns the loads function of a backend by name, 'auto' for the fastest installed one"""
+    loads = loaders.get(backend)
+    if loads is None:
+        if backend == 'auto':
+            loads = next(loads for loads in map(installed, auto_backends) if loads)
+        elif backend in json_backends:
+            loads = installed(backend)
+            if loads is None:
+                raise NotSupported('JSON backend ' + backend + ' is not installed')
+        else:
+            raise NotSupported('unknown JSON backend ' + str(backend) + ', use one of ' + ', '.join(['auto'] + sorted(json_backends.keys())))
+        loaders[backend] = loads
+    return loads
+
+
+def installed(backend):
+    loads = json_backends.get(backend)
+    if loads is None:
+        try:
+            loads = json_backends[backend] = importlib.import_module(backend).loads
+        except ImportError:
+            return None
+    return loads
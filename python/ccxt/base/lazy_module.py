@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""Deferred import of exchange classes on first attribute access"""
+
+# -----------------------------------------------------------------------------
+
+import importlib
+import sys
+import types
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'LazyModule',
+    'lazy_module',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class LazyModule(types.ModuleType):
+    """A package whose public classes are imported from their modules on first access
+
+    The `__lazy__` dict maps an attribute name to the dotted path of the module
+    that defines a class with that same name."""
+
+    def __getattr__(self, name):
+        lazy = self.__dict__.get('__lazy__', {})
+        if name not in lazy:
+            raise AttributeError("module '" + self.__name__ + "' has no attribute '" + name + "'")
+        module = importlib.import_module(lazy[name])
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # importing ccxt.binance makes the import system bind the binance module
+        # on the ccxt package, keep the name pointing to the binance class instead
+        if isinstance(value, types.ModuleType) and (name in self.__dict__.get('__lazy__', {})):
+            value = getattr(value, name, value)
+        types.ModuleType.__setattr__(self, name, value)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) | set(self.__dict__.get('__lazy__', {}).keys()))
+
+
+def lazy_module(name, lazy):
+    """Turns the already imported module `name` into a LazyModule"""
+    module = sys.modules[name]
+    module.__lazy__ = lazy
+    if sys.version_info >= (3, 5):
+        module.__class__ = LazyModule
+    else:
+        # modules can't change their class before Python 3.5, import everything right away
+        for attribute, path in lazy.items():
+            setattr(module, attribute, getattr(importlib.import_module(path), attribute))
+    return module
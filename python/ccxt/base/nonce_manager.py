@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""Strictly increasing nonces per credential set"""
+
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    replace_file = os.replace  # Python 3.3+
+except AttributeError:
+    replace_file = os.rename   # atomic on POSIX
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'NonceManager',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class NonceManager(object):
+    """Raises every nonce above the last one issued for the same key
+
+    One manager per key and file is shared by all the threads, coroutines and
+    exchange instances of a process. With a file the last nonce of every key
+    is kept there under an exclusive lock, so other processes and restarts
+    continue from it even if the clock went backwards in between. The file is
+    replaced atomically, a crash leaves either the old or the new one."""
+
+    managers = {}  # (key, path) → instance
+    managers_lock = threading.Lock()
+
+    def __init__(self, key, path=None):
+        if path and fcntl is None:
+            raise NotSupported('persisting nonces to ' + path + ' requires fcntl, which this platform does not have')
+        self.key = key
+        self.path = path
+        self.last = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def get(cls, key, path=None):
+        path = os.path.abspath(path) if path else None
+        manager = cls.managers.get((key, path))
+        if manager is None:
+            with cls.managers_lock:
+                manager = cls.managers.setdefault((key, path), cls(key, path))
+        return manager
+
+    def next(self, nonce):
+        """Returns nonce, or one more than the last nonce issued if nonce is not greater"""
+        with self.lock:
+            if self.path:
+                return self.next_persisted(nonce)
+            if (self.last is not None) and (nonce <= self.last):
+                nonce = self.last + 1
+            self.last = nonce
+            return nonce
+
+    def next_persisted(self, nonce):
+        # the file is replaced on every write, the lock is held on a file of its own
+        fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            nonces = self.read()
+            last = nonces.get(self.key)
+            if (self.last is not None) and ((last is None) or (last < self.last)):
+                last = self.last  # the file was lost or unreadable
+            if (last is not None) and (nonce <= last):
+                nonce = last + 1
+            nonces[self.key] = nonce
+            self.write(nonces)
+            self.last = nonce
+            return nonce
+        finally:
+            os.close(fd)  # releases the lock
+
+    def read(self):
+        """Returns the persisted nonces, starting over if the file is missing or unreadable"""
+        try:
+            with open(self.path, 'rb') as f:
+                nonces = json.loads(f.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            return {}
+        if not isinstance(nonces, dict):
+            return {}
+        return dict((key, value) for key, value in nonces.items() if isinstance(value, (int, float)))
+
+    def write(self, nonces):
+        fd, temporary = tempfile.mkstemp(prefix='.' + os.path.basename(self.path) + '-', dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(nonces).encode('utf-8'))
+            replace_file(temporary, self.path)
+        except Exception:
+            os.remove(temporary)
+            raise
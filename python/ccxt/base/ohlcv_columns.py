@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""OHLCV candles as one column per field, with ohlcvFormat 'array' or 'numpy'"""
+
+# -----------------------------------------------------------------------------
+
+import array
+import itertools
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.errors import ExchangeError
+from ccxt.base.errors import NotSupported
+from ccxt.base.order_book_array import numpy_module
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ohlcv_columns',
+    'ohlcv_fields',
+]
+
+# -----------------------------------------------------------------------------
+
+ohlcv_fields = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+try:
+    array.array('q')
+    int64 = 'q'
+except ValueError:  # Python 2, where long is 64 bits on the platforms that matter
+    int64 = 'l'
+
+
+def ohlcv_columns(ohlcvs, format='array', since=None, limit=None):
+    """Returns {field: column} of an iterable of [timestamp, open, high, low, close, volume] candles
+
+    The timestamps are int64 and the other fields float64, in array.array or
+    numpy arrays, with nan for missing values. Candles before since are left
+    out and at most limit kept."""
+    if format == 'numpy':
+        return numpy_columns(ohlcvs, since, limit)
+    elif format == 'array':
+        return array_columns(ohlcvs, since, limit)
+    raise NotSupported('unknown ohlcvFormat ' + str(format) + ', use one of list, array, numpy')
+
+
+def unified_candles(ohlcvs):
+    """Yields the first six fields of every candle, with None values as nan"""
+    nan = float('nan')
+    for ohlcv in ohlcvs:
+        if (len(ohlcv) < 6) or (ohlcv[0] is None):
+            raise ExchangeError('OHLCV candle ' + str(ohlcv) + ' does not have a timestamp and the five values of open, high, low, close and volume')
+        if len(ohlcv) > 6:  # raw candles with more fields
+            ohlcv = ohlcv[0:6]
+        if None in ohlcv:
+            ohlcv = [nan if value is None else value for value in ohlcv]
+        yield ohlcv
+
+
+def array_columns(ohlcvs, since=None, limit=None):
+    columns = [array.array(int64)] + [array.array('d') for field in ohlcv_fields[1:]]
+    timestamps, opens, highs, lows, closes, volumes = [column.append for column in columns]
+    count = 0
+    for ohlcv in unified_candles(ohlcvs):
+        if limit and (count >= limit):
+            break
+        if since and (ohlcv[0] < since):
+            continue
+        timestamps(int(ohlcv[0]))
+        opens(float(ohlcv[1]))
+        highs(float(ohlcv[2]))
+        lows(float(ohlcv[3]))
+        closes(float(ohlcv[4]))
+        volumes(float(ohlcv[5]))
+        count += 1
+    return dict(zip(ohlcv_fields, columns))
+
+
+def numpy_columns(ohlcvs, since=None, limit=None):
+    numpy = numpy_module()
+    count = len(ohlcvs) * 6 if isinstance(ohlcvs, list) else -1
+    values = numpy.fromiter(itertools.chain.from_iterable(unified_candles(ohlcvs)), dtype=numpy.float64, count=count)
+    table = values.reshape(-1, 6)
+    if since:
+        table = table[table[:, 0] >= since]
+    if limit:
+        table = table[0:limit]
+    columns = [table[:, 0].astype(numpy.int64)] + [numpy.ascontiguousarray(table[:, i]) for i in range(1, 6)]
+    return dict(zip(ohlcv_fields, columns))
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+
+"""Local store of OHLCV candles in memory-mapped files, filled incrementally from an exchange"""
+
+# -----------------------------------------------------------------------------
+
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+
+try:
+    import urllib.parse as _urlencode  # Python 3
+except ImportError:
+    import urllib as _urlencode        # Python 2
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    replace_file = os.replace  # Python 3.3+, replaces an existing file on Windows too
+except AttributeError:
+    replace_file = os.rename
+
+if sys.version_info[0] >= 3:
+    def read_only_view(memory, start, end):
+        return memoryview(memory)[start:end]
+else:  # the mmaps of Python 2 only have the old buffer interface
+    def read_only_view(memory, start, end):
+        return buffer(memory, start, end - start)  # noqa: F821
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.ohlcv_columns import ohlcv_fields
+from ccxt.base.order_book_array import numpy_module
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'OhlcvFile',
+    'OhlcvStore',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class OhlcvFile(object):
+    """Candles of one symbol and timeframe as fixed-width records sorted by timestamp
+
+    A record is the int64 timestamp and the float64 open, high, low, close and
+    volume, little-endian and without padding, so the file is an array of the
+    numpy dtype of numpy_dtype(). New candles are appended, candles older than
+    the last one are merged into a new file that replaces the old one, so the
+    views handed out before stay valid. The spans the exchange was found to
+    have no candles for are kept as int64 pairs in a .checked file next to it."""
+
+    record = struct.Struct('<qddddd')
+    timestamp_field = struct.Struct('<q')
+    span = struct.Struct('<qq')
+
+    def __init__(self, path):
+        self.path = path
+        self.checked_path = path + '.checked'
+        self.lock = threading.Lock()
+        self.fd = None
+        self.inode = None
+        self.memory = None
+        self.size = 0
+        self.open_file()
+        # the data file is replaced on merges, so processes take turns writing through a lock file of their own
+        self.lock_fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644) if fcntl else None
+
+    def open_file(self):
+        if self.fd is not None:
+            os.close(self.fd)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.inode = os.fstat(self.fd).st_ino
+        self.memory = None
+        self.size = 0
+
+    def remap(self):
+        """Maps the records written since the last call, by this process or another one"""
+        if os.stat(self.path).st_ino != self.inode:
+            self.open_file()
+        size = os.fstat(self.fd).st_size
+        size -= size % self.record.size  # a record being appended by another process
+        if size != self.size:
+            # the previous mapping is not closed, it lives on while views of it exist
+            self.memory = mmap.mmap(self.fd, size, access=mmap.ACCESS_READ) if size else None
+            self.size = size
+
+    def __len__(self):
+        return self.size // self.record.size
+
+    def timestamp(self, index):
+        return self.timestamp_field.unpack_from(self.memory, index * self.record.size)[0]
+
+    def bisect(self, timestamp):
+        """Returns the index of the first record at or after timestamp, in O(log n)"""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def view(self, since=None, until=None):
+        """Returns a read-only memoryview of the records from since up to until, without copying them
+
+        On Python 2 the view is a buffer, which supports the same len, slicing and struct reads."""
+        with self.lock:
+            self.remap()
+            if not self.memory:
+                return memoryview(b'')
+            lo = 0 if since is None else self.bisect(since)
+            hi = len(self) if until is None else self.bisect(until)
+            return read_only_view(self.memory, lo * self.record.size, max(lo, hi) * self.record.size)
+
+    def ohlcvs(self, since=None, until=None):
+        view = self.view(since, until)
+        return [list(self.record.unpack_from(view, offset)) for offset in range(0, len(view), self.record.size)]
+
+    def gaps(self, since, until, duration):
+        """Returns the [from, to] spans from since up to until without candles, in O(g log n) for g gaps"""
+        with self.lock:
+            self.remap()
+            start = int(math.ceil(since / float(duration))) * duration
+            lo = self.bisect(start) if self.memory else 0
+            hi = self.bisect(until) if self.memory else 0
+            gaps = []
+            expected = start
+            if lo < hi:
+                if self.timestamp(lo) > start:
+                    gaps.append([start, self.timestamp(lo)])
+                self.inner_gaps(lo, hi - 1, duration, gaps)
+                expected = self.timestamp(hi - 1) + duration
+            if expected < until:
+                gaps.append([expected, until])
+            return gaps
+
+    def inner_gaps(self, first, last, duration, gaps):
+        # the records from first to last are contiguous if their timestamps span exactly that many candles
+        if self.timestamp(last) - self.timestamp(first) == (last - first) * duration:
+            return
+        if last == first + 1:
+            gaps.append([self.timestamp(first) + duration, self.timestamp(last)])
+            return
+        middle = (first + last) // 2
+        self.inner_gaps(first, middle, duration, gaps)
+        self.inner_gaps(middle, last, duration, gaps)
+
+    def checked(self):
+        """Returns the [from, to] spans marked as checked, sorted by from"""
+        try:
+            with open(self.checked_path, 'rb') as file:
+                data = file.read()
+        except (IOError, OSError):  # nothing checked yet
+            return []
+        data = data[:len(data) - len(data) % self.span.size]  # a span being appended by another process
+        return sorted([list(self.span.unpack_from(data, offset)) for offset in range(0, len(data), self.span.size)])
+
+    def check(self, gaps):
+        """Marks the [from, to] spans as checked, sync does not fetch them again"""
+        if not gaps:
+            return
+        with self.lock:
+            if self.lock_fd is not None:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_EX)
+            try:
+                fd = os.open(self.checked_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                try:
+                    os.write(fd, b''.join(self.span.pack(int(start), int(end)) for start, end in gaps))
+                finally:
+                    os.close(fd)
+            finally:
+                if self.lock_fd is not None:
+                    fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+
+    def unchecked(self, gaps):
+        """Returns the parts of gaps outside the spans marked as checked"""
+        checked = self.checked()
+        result = []
+        for start, end in gaps:
+            if start is not None:
+                for checked_start, checked_end in checked:
+                    if (checked_end <= start) or (checked_start >= end):
+                        continue
+                    if checked_start > start:
+                        result.append([start, checked_start])
+                    start = checked_end
+                    if start >= end:
+                        break
+            if (start is None) or (start < end):
+                result.append([start, end])
+        return result
+
+    def write(self, ohlcvs):
+        """Adds the candles that are not in the file yet, returns how many"""
+        with self.lock:
+            if self.lock_fd is not None:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_EX)
+            try:
+                self.remap()
+                last = self.timestamp(len(self) - 1) if self.memory else None
+                candles = {}
+                older = False
+                for ohlcv in ohlcvs:
+                    timestamp = int(ohlcv[0])
+                    if (last is not None) and (timestamp <= last):
+                        index = self.bisect(timestamp)
+                        if (index < len(self)) and (self.timestamp(index) == timestamp):
+                            continue
+                        older = True
+                    candles[timestamp] = ohlcv
+                added = len(candles)
+                if older:
+                    candles.update(dict((ohlcv[0], ohlcv) for ohlcv in self.records()))
+                    self.replace([candles[timestamp] for timestamp in sorted(candles.keys())])
+                elif candles:
+                    os.lseek(self.fd, self.size, os.SEEK_SET)
+                    os.write(self.fd, self.pack([candles[timestamp] for timestamp in sorted(candles.keys())]))
+                return added
+            finally:
+                if self.lock_fd is not None:
+                    fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+
+    def records(self):
+        # must be called with self.lock held
+        return [list(self.record.unpack_from(self.memory, offset)) for offset in range(0, self.size, self.record.size)]
+
+    def replace(self, ohlcvs):
+        path = self.path + '.tmp'
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, self.pack(ohlcvs))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        replace_file(path, self.path)  # atomic, readers keep the mappings of the old file
+
+    def pack(self, ohlcvs):
+        nan = float('nan')
+        return b''.join(self.record.pack(int(ohlcv[0]), *[nan if value is None else value for value in ohlcv[1:6]]) for ohlcv in ohlcvs)
+
+    def close(self):
+        with self.lock:
+            for fd in [self.fd, self.lock_fd]:
+                if fd is not None:
+                    os.close(fd)
+            self.fd = self.lock_fd = None
+            self.memory = None
+            self.size = 0
+
+
+class OhlcvStore(object):
+    """Candles by exchange id, symbol and timeframe, one OhlcvFile each under directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = {}
+        self.files_lock = threading.Lock()
+
+    @staticmethod
+    def numpy_dtype():
+        numpy = numpy_module()
+        return numpy.dtype([(field, '<i8' if field == 'timestamp' else '<f8') for field in ohlcv_fields])
+
+    def path(self, exchange_id, symbol, timeframe):
+        quote = lambda string: _urlencode.quote(string, safe='')  # noqa: E731
+        return os.path.join(self.directory, quote(exchange_id), quote(symbol), quote(timeframe) + '.ohlcv')
+
+    def file(self, exchange_id, symbol, timeframe):
+        key = (exchange_id, symbol, timeframe)
+        with self.files_lock:
+            if key not in self.files:
+                path = self.path(exchange_id, symbol, timeframe)
+                directory = os.path.dirname(path)
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+                self.files[key] = OhlcvFile(path)
+            return self.files[key]
+
+    def view(self, exchange_id, symbol, timeframe, since=None, until=None):
+        return self.file(exchange_id, symbol, timeframe).view(since, until)
+
+    def ohlcvs(self, exchange_id, symbol, timeframe, since=None, until=None):
+        """Returns the candles from since up to until as a list of [timestamp, open, high, low, close, volume]"""
+        return self.file(exchange_id, symbol, timeframe).ohlcvs(since, until)
+
+    def numpy(self, exchange_id, symbol, timeframe, since=None, until=None):
+        """Returns the candles from since up to until as a numpy record array over the mapped file"""
+        numpy = numpy_module()
+        return numpy.frombuffer(self.view(exchange_id, symbol, timeframe, since, until), dtype=self.numpy_dtype())
+
+    def gaps(self, exchange_id, symbol, timeframe, since, until, duration):
+        return self.file(exchange_id, symbol, timeframe).gaps(since, until, duration)
+
+    def unchecked(self, exchange_id, symbol, timeframe, gaps):
+        return self.file(exchange_id, symbol, timeframe).unchecked(gaps)
+
+    def write(self, exchange_id, symbol, timeframe, ohlcvs):
+        if isinstance(ohlcvs, dict):  # ohlcvFormat 'array' or 'numpy'
+            ohlcvs = zip(*[ohlcvs[field] for field in ohlcv_fields])
+        return self.file(exchange_id, symbol, timeframe).write(ohlcvs)
+
+    def sync_range(self, exchange, symbol, timeframe='1m', since=None, until=None):
+        """Returns (since, until, gaps) of a sync, until excludes the candle in progress
+
+        An empty store without since has a single gap of [None, until], for
+        fetch_ohlcv_range to fetch the latest window of candles."""
+        duration = exchange.parse_timeframe(timeframe) * 1000
+        current = exchange.milliseconds() // duration * duration
+        until = current if until is None else min(until, current)
+        if since is None:
+            view = self.view(exchange.id, symbol, timeframe)
+            if not len(view):
+                return (None, until, [[None, until]])
+            since = OhlcvFile.timestamp_field.unpack_from(view, 0)[0]
+        return (since, until, self.gaps(exchange.id, symbol, timeframe, since, until, duration))
+
+    def store_range(self, exchange, symbol, timeframe, until, result):
+        ohlcvs = result['ohlcv']
+        if isinstance(ohlcvs, dict):
+            ohlcvs = zip(*[ohlcvs[field] for field in ohlcv_fields])
+        added = self.write(exchange.id, symbol, timeframe, [ohlcv for ohlcv in ohlcvs if ohlcv[0] < until])
+        # a gap followed by a candle will not be filled later, a gap at the end may be
+        self.file(exchange.id, symbol, timeframe).check([gap for gap in result['gaps'] if gap[1] < until])
+        return added
+
+    def sync(self, exchange, symbol, timeframe='1m', since=None, until=None):
+        """Fetches the candles missing from since up to until, returns the gaps the exchange has no candles for
+
+        Without since the sync starts at the first stored candle, or fetches the
+        latest window of candles into an empty store. Gaps the exchange had no
+        candles for before are not fetched again."""
+        since, until, gaps = self.sync_range(exchange, symbol, timeframe, since, until)
+        for start, end in self.unchecked(exchange.id, symbol, timeframe, gaps):
+            result = exchange.fetch_ohlcv_range(symbol, timeframe, start, end)
+            self.store_range(exchange, symbol, timeframe, end, result)
+        return self.sync_range(exchange, symbol, timeframe, since, until)[2]
+
+    def close(self):
+        with self.files_lock:
+            for ohlcv_file in self.files.values():
+                ohlcv_file.close()
+            self.files = {}
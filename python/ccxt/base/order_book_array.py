@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Order book sides as float64 numpy arrays of shape (n, 2), with orderBookFormat 'numpy'"""
+
+# -----------------------------------------------------------------------------
+
+import importlib
+import itertools
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'aggregate_array',
+    'bids_asks_array',
+    'numpy_module',
+]
+
+# -----------------------------------------------------------------------------
+
+modules = {}
+
+
+def numpy_module():
+    """Imports numpy on first use, so that it is only needed by those who ask for arrays"""
+    numpy = modules.get('numpy')
+    if numpy is None:
+        try:
+            numpy = modules['numpy'] = importlib.import_module('numpy')
+        except ImportError:
+            raise NotSupported('orderBookFormat numpy requires numpy, install it with pip install numpy')
+    return numpy
+
+
+def bids_asks_array(bidasks, price_key=0, amount_key=1):
+    """Returns the [price, amount] of every level in a float64 array, parsing all of them in one pass"""
+    numpy = numpy_module()
+    if (price_key == 0) and (amount_key == 1) and not isinstance(bidasks[0] if bidasks else None, dict):
+        try:
+            values = numpy.fromiter(itertools.chain.from_iterable(bidasks), dtype=numpy.float64)
+            if len(values) == len(bidasks) * 2:
+                return values.reshape(-1, 2)
+        except ValueError:
+            pass
+        # levels with more fields than price and amount
+    keys = (price_key, amount_key)
+    values = numpy.fromiter((bidask[key] for bidask in bidasks for key in keys), dtype=numpy.float64, count=len(bidasks) * 2)
+    return values.reshape(-1, 2)
+
+
+def aggregate_array(bidasks, descending=False):
+    """Sums the amounts of equal prices and sorts the levels by price, like Exchange.aggregate and sort_by"""
+    numpy = numpy_module()
+    prices, inverse = numpy.unique(bidasks[:, 0], return_inverse=True)
+    amounts = numpy.bincount(inverse.ravel(), weights=bidasks[:, 1], minlength=len(prices))
+    levels = numpy.column_stack((prices, amounts))
+    return numpy.ascontiguousarray(levels[::-1]) if descending else levels
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""In-memory LRU cache of raw REST responses with per-entry expiry"""
+
+# -----------------------------------------------------------------------------
+
+import collections
+import threading
+import time
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ResponseCache',
+]
+
+# -----------------------------------------------------------------------------
+
+try:
+    monotonic = time.monotonic  # Python 3
+except AttributeError:
+    monotonic = time.time       # Python 2
+
+# -----------------------------------------------------------------------------
+
+
+class ResponseCache(object):
+    """A thread-safe LRU cache of response bodies, bounded by their total size
+
+    Bodies are kept as the str or bytes that came from the network, so the
+    budget is measured exactly and every hit is parsed into a fresh object
+    that the caller is free to modify."""
+
+    def __init__(self, max_size=16 * 1024 * 1024):
+        self.max_size = max_size  # bytes
+        self.size = 0
+        self.entries = collections.OrderedDict()  # key → (expires, body), least recently used first
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evicted': 0,
+        }
+
+    def get(self, key):
+        """Returns the body cached under key or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, body = entry
+                if expires > monotonic():
+                    self.entries[key] = self.entries.pop(key)  # most recently used
+                    self.stats['hits'] += 1
+                    return body
+                self.remove(key)
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key, body, ttl):
+        """Caches body under key for ttl milliseconds, evicting the least recently used bodies over budget"""
+        if body is None or len(body) > self.max_size:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = (monotonic() + ttl / 1000.0, body)
+            self.size += len(body)
+            while self.size > self.max_size:
+                self.remove(next(iter(self.entries)))
+                self.stats['evicted'] += 1
+
+    def remove(self, key):
+        expires, body = self.entries.pop(key)
+        self.size -= len(body)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""Details of the last response of an Exchange, per thread in threadSafe mode"""
+
+# -----------------------------------------------------------------------------
+
+import threading
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ResponseState',
+    'ThreadLocalResponseState',
+    'response_state_property',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class ResponseState(object):
+
+    http_response_body = None  # raw bytes of the last response, decoded on access
+    last_json_response = None
+    last_http_status_code = None
+    last_response_headers = None
+
+
+class ThreadLocalResponseState(ResponseState, threading.local):
+    """Every thread sees the defaults of ResponseState until it sets its own values"""
+    pass
+
+
+def response_state_property(name):
+    """Returns a property that reads and writes name in exchange.response_state"""
+
+    def getter(self):
+        return getattr(self.response_state, name)
+
+    def setter(self, value):
+        setattr(self.response_state, name, value)
+
+    return property(getter, setter)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+from ccxt.base.token_bucket_file import TokenBucketFile
+
+__all__ = [
+    'shared_throttle',
+    'throttle',
+]
+
+try:
+    monotonic = time.monotonic  # Python 3
+except AttributeError:
+    monotonic = time.time       # Python 2
+
+
+def throttle(config=None):
+    """Thread-safe token bucket that sleeps the calling thread
+
+    Every call takes its cost from the bucket right away, possibly leaving it
+    in debt, and then sleeps for as long as it takes to pay back the debt it
+    queued behind. Concurrent threads are thus served in the order of their
+    calls and a heavier call delays the ones after it, like the async bucket."""
+
+    cfg = {
+        'refillRate': 0.001,  # tokens per millisecond
+        'defaultCost': 1.000,
+        'capacity': 1.000,
+    }
+
+    cfg.update(config or {})
+
+    lock = threading.Lock()
+
+    cfg['lastTimestamp'] = monotonic()
+    cfg['numTokens'] = cfg.get('numTokens', cfg['capacity'])
+
+    def refill():
+        now = monotonic()
+        elapsed = (now - cfg['lastTimestamp']) * 1000
+        cfg['lastTimestamp'] = now
+        cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'])
+
+    def throttle(cost=None):
+        cost = cfg['defaultCost'] if cost is None else cost
+        with lock:
+            refill()
+            # a call can go as soon as the bucket holds its cost, or is full for calls costlier than the capacity
+            missing = min(cost, cfg['capacity']) - cfg['numTokens']
+            cfg['numTokens'] -= cost
+        if missing > 0:
+            time.sleep(missing / cfg['refillRate'] / 1000)
+
+    def pause(milliseconds):
+        """Puts the bucket in debt for the next calls to wait at least that long"""
+        with lock:
+            refill()
+            cfg['numTokens'] = min(cfg['numTokens'], -milliseconds * cfg['refillRate'])
+
+    throttle.cfg = cfg
+    throttle.pause = pause
+    return throttle
+
+
+def shared_throttle(config=None):
+    """Token bucket kept in a TokenBucketFile, shared by every process that opens the file with the same key"""
+
+    cfg = {
+        'refillRate': 0.001,  # tokens per millisecond
+        'defaultCost': 1.000,
+        'capacity': 1.000,
+        'file': None,         # path
+        'key': 'default',
+    }
+
+    cfg.update(config or {})
+
+    bucket_file = TokenBucketFile.open(cfg['file'])
+
+    def throttle(cost=None):
+        delay = bucket_file.update(cfg['key'], cfg, cfg['defaultCost'] if cost is None else cost)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def pause(milliseconds):
+        """Puts the bucket in debt for the next calls of all processes to wait at least that long"""
+        bucket_file.update(cfg['key'], cfg, 0, milliseconds * cfg['refillRate'])
+
+    throttle.cfg = cfg
+    throttle.pause = pause
+    return throttle
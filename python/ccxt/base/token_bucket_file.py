@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""Token buckets in a memory-mapped file, shared by the processes of a host"""
+
+# -----------------------------------------------------------------------------
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'TokenBucketFile',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class TokenBucketFile(object):
+    """A table of token buckets by key in a file mapped into memory
+
+    Every process that opens the same path shares the same buckets. A call
+    takes its cost from a bucket under an exclusive lock of the file, exactly
+    like the in-process sync throttle, and gets back how long it has to wait,
+    so the aggregate rate of all processes stays within the refill rate."""
+
+    magic = b'ccxttbf1'
+    header = struct.Struct('<8sI')
+    slot = struct.Struct('<48sdd')  # key, number of tokens, last timestamp in milliseconds
+
+    files = {}  # path → instance, one mapping per process
+    files_lock = threading.Lock()
+
+    def __init__(self, path, slots=256):
+        if fcntl is None:
+            raise NotSupported('sharing rate limits through ' + path + ' requires fcntl, which this platform does not have')
+        self.path = path
+        self.slots = slots
+        self.lock = threading.Lock()  # flock does not exclude the threads that share one file descriptor
+        self.open_file()
+
+    def open_file(self):
+        # a forked child shares the open file description of its parent and with it the flock, so it opens its own
+        self.pid = os.getpid()
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self.fd).st_size
+            if size < self.header.size:
+                os.ftruncate(self.fd, self.header.size + self.slots * self.slot.size)
+                os.write(self.fd, self.header.pack(self.magic, self.slots))
+            self.memory = mmap.mmap(self.fd, 0)
+            magic, self.slots = self.header.unpack_from(self.memory, 0)
+            if magic != self.magic:
+                raise NotSupported(self.path + ' is not a token bucket file')
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    @classmethod
+    def open(cls, path):
+        path = os.path.abspath(path)
+        with cls.files_lock:
+            if path not in cls.files:
+                cls.files[path] = cls(path)
+            return cls.files[path]
+
+    def find(self, key):
+        """Returns the offset of the slot of key, claiming an empty one for a new key"""
+        key = key.encode('utf-8')
+        if len(key) > 48:
+            key = key[0:40] + ('%08x' % (zlib.crc32(key) & 0xffffffff)).encode('ascii')
+        start = zlib.crc32(key) % self.slots
+        for i in range(0, self.slots):
+            offset = self.header.size + ((start + i) % self.slots) * self.slot.size
+            slot_key = self.memory[offset:offset + 48].rstrip(b'\0')
+            if slot_key == key:
+                return offset
+            if not slot_key:
+                self.slot.pack_into(self.memory, offset, key, 0.0, 0.0)
+                return offset
+        raise NotSupported('all ' + str(self.slots) + ' token buckets in ' + self.path + ' are taken')
+
+    def update(self, key, cfg, cost=0, debt=None):
+        """Refills the bucket of key, takes cost from it and returns the milliseconds to wait for it
+
+        A debt in tokens puts the bucket that deep below zero at most, to pause all of its users."""
+        with self.lock:
+            if self.pid != os.getpid():
+                self.open_file()
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                offset = self.find(key)
+                slot_key, num_tokens, last_timestamp = self.slot.unpack_from(self.memory, offset)
+                now = time.time() * 1000
+                if not last_timestamp:
+                    num_tokens = cfg['capacity']
+                elapsed = max(now - last_timestamp, 0)
+                num_tokens = min(cfg['capacity'], num_tokens + elapsed * cfg['refillRate'])
+                missing = min(cost, cfg['capacity']) - num_tokens if cost else 0
+                num_tokens -= cost
+                if debt is not None:
+                    num_tokens = min(num_tokens, -debt)
+                self.slot.pack_into(self.memory, offset, slot_key, num_tokens, now)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return max(missing, 0) / cfg['refillRate']
@@ -649,7 +649,7 @@ class binance (Exchange):
             url += '.html'
         if (api == 'private') or (api == 'wapi'):
             self.check_required_credentials()
-            nonce = self.milliseconds()
+            nonce = self.nonce()
             query = self.urlencode(self.extend({'timestamp': nonce}, params))
             signature = self.hmac(self.encode(query), self.encode(self.secret))
             query += '&' + 'signature=' + signature
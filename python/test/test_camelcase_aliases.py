@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def create_class():
+
+    class aliased(ccxt.Exchange):
+
+        circuitBreaker = {'failureThreshold': 3}
+
+        def describe(self):
+            return self.deep_extend(super(aliased, self).describe(), {
+                'id': 'aliased',
+                'api': {
+                    'public': {'get': ['ticker']},
+                },
+            })
+
+        def fetch_ticker(self, symbol, params={}):
+            return 'snake'
+
+        def fetch_trades(self, symbol, since=None, limit=None, params={}):
+            return 'snake'
+
+        def fetchTrades(self, symbol, since=None, limit=None, params={}):
+            return 'camel'
+
+        def circuit_breaker(self):
+            return 'method'
+
+        @staticmethod
+        def sum_values(*args):
+            return sum(args)
+
+        @classmethod
+        def class_id(cls):
+            return cls.__name__
+
+    return aliased
+
+
+def test_camelcase_aliases():
+    aliased = create_class()
+    exchange = aliased()
+    # aliases live on the class and resolve to the overriding method
+    assert 'fetchTicker' not in exchange.__dict__
+    assert exchange.fetchTicker('BTC/USD') == 'snake'
+    assert aliased.__dict__['fetchTicker'] is aliased.__dict__['fetch_ticker']
+    assert exchange.camelcase_aliases['fetchTicker'] == 'fetch_ticker'
+    assert exchange.sumValues(1, 2) == 3
+    assert aliased.sumValues(1, 2) == 3
+    assert exchange.classId() == 'aliased'
+    assert exchange.loadMarkets.__func__ is exchange.load_markets.__func__
+    # base class aliases are inherited
+    assert exchange.safeString({'a': '1'}, 'a') == '1'
+
+
+def test_camelcase_aliases_do_not_clobber():
+    aliased = create_class()
+    exchange = aliased()
+    # a camelCase method written in the class body wins over the alias
+    assert exchange.fetchTrades('BTC/USD') == 'camel'
+    assert exchange.fetch_trades('BTC/USD') == 'snake'
+    # as does a config option of the same name
+    assert exchange.circuitBreaker == {'failureThreshold': 3}
+    assert exchange.circuit_breaker() == 'method'
+    assert 'circuitBreaker' not in exchange.camelcase_aliases
+    # implicit methods keep their own camelCase names
+    assert exchange.publicGetTicker.__func__ is exchange.public_get_ticker.__func__
+
+
+def test_camelcase():
+    assert ccxt.Exchange.camelcase('fetch_order_book') == 'fetchOrderBook'
+    assert ccxt.Exchange.camelcase('public_get_') == 'publicGet'
+    assert ccxt.Exchange.camelcase('private_post__order') == 'privatePostOrder'
+
+
+if __name__ == '__main__':
+    test_camelcase_aliases()
+    test_camelcase_aliases_do_not_clobber()
+    test_camelcase()
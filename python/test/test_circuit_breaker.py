@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.circuit_breaker import CircuitBreaker  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class FailingExchange(ccxt.Exchange):
+
+    error = None
+
+    def describe(self):
+        return self.deep_extend(super(FailingExchange, self).describe(), {
+            'id': 'mock',
+            'api': {
+                'public': {'get': ['ticker']},
+                'private': {'get': ['balance']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': path, 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {}
+
+
+def call(exchange, method):
+    try:
+        return getattr(exchange, method)()
+    except ccxt.BaseError as e:
+        return e
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=50)
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.success()
+    breaker.failure()
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_in() <= 50
+    time.sleep(0.06)
+    # a single probe while half-open
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.status()['state'] == CircuitBreaker.CLOSED
+
+
+def test_exchange_circuit_breaker():
+    exchange = FailingExchange({
+        'circuitBreaker': {'failureThreshold': 3, 'resetTimeout': 50, 'halfOpenProbes': 1, 'scope': 'api'},
+    })
+    exchange.calls = 0
+    exchange.error = ccxt.RequestTimeout('timed out')
+    for i in range(0, 3):
+        assert isinstance(call(exchange, 'publicGetTicker'), ccxt.RequestTimeout)
+    # an open breaker fails fast without calling the exchange
+    error = call(exchange, 'publicGetTicker')
+    assert isinstance(error, ccxt.ExchangeNotAvailable)
+    assert 'circuit breaker' in str(error)
+    assert exchange.calls == 3
+    assert exchange.circuit_breaker_status()['public']['state'] == 'open'
+    # other api groups have breakers of their own
+    exchange.error = None
+    assert call(exchange, 'privateGetBalance') == {}
+    # errors the exchange replies with do not count as failures
+    exchange.error = ccxt.ExchangeError('bad symbol')
+    for i in range(0, 5):
+        assert isinstance(call(exchange, 'privateGetBalance'), ccxt.ExchangeError)
+    assert exchange.circuit_breaker_status()['private']['state'] == 'closed'
+    time.sleep(0.06)
+    exchange.error = None
+    assert call(exchange, 'publicGetTicker') == {}
+    assert exchange.circuit_breaker_status()['public']['state'] == 'closed'
+
+
+def test_circuit_breaker_failures():
+    exchange = FailingExchange({
+        'circuitBreaker': {'failureThreshold': 2, 'resetTimeout': 50, 'halfOpenProbes': 1, 'scope': 'api'},
+    })
+    exchange.calls = 0
+    # client errors are replies, even when they are mapped to ExchangeNotAvailable
+    for status in [400, 403, 404, 405, 409, 422]:
+        exchange.error = exchange.annotate_error(ccxt.ExchangeNotAvailable(str(status)), status, {})
+        assert isinstance(call(exchange, 'publicGetTicker'), ccxt.ExchangeNotAvailable)
+    assert exchange.circuit_breaker_status()['public']['state'] == 'closed'
+    # server errors are not
+    exchange.error = exchange.annotate_error(ccxt.ExchangeError('bad gateway'), 502, {})
+    call(exchange, 'publicGetTicker')
+    call(exchange, 'publicGetTicker')
+    assert exchange.circuit_breaker_status()['public']['state'] == 'open'
+    # as are requests that got no reply, which the async fetch raises as ExchangeError
+    unreachable = ccxt.ExchangeError('connection refused')
+    unreachable.unreachable = True
+    assert exchange.is_circuit_failure(unreachable)
+    assert not exchange.is_circuit_failure(ccxt.ExchangeError('invalid symbol'))
+
+
+def test_circuit_breaker_interrupted_probe():
+    exchange = FailingExchange({
+        'circuitBreaker': {'failureThreshold': 1, 'resetTimeout': 50, 'halfOpenProbes': 1, 'scope': 'api'},
+    })
+    exchange.calls = 0
+    exchange.error = ccxt.RequestTimeout('timed out')
+    call(exchange, 'publicGetTicker')
+    time.sleep(0.06)
+    # an interrupted probe gives its slot back instead of keeping the breaker half-open forever
+    exchange.error = KeyboardInterrupt()
+    try:
+        call(exchange, 'publicGetTicker')
+        assert False
+    except KeyboardInterrupt:
+        pass
+    assert exchange.circuit_breaker_status()['public']['state'] == 'half-open'
+    exchange.error = None
+    assert call(exchange, 'publicGetTicker') == {}
+    assert exchange.circuit_breaker_status()['public']['state'] == 'closed'
+
+
+def test_circuit_breaker_stops_retries():
+    exchange = FailingExchange({
+        'circuitBreaker': {'failureThreshold': 2, 'resetTimeout': 1000, 'halfOpenProbes': 1, 'scope': 'exchange'},
+        'retryPolicy': {'maxRetries': 5, 'baseDelay': 1, 'maxDelay': 1, 'deadline': 1000, 'idempotent': []},
+    })
+    exchange.calls = 0
+    exchange.error = ccxt.ExchangeNotAvailable('service unavailable')
+    assert isinstance(call(exchange, 'publicGetTicker'), ccxt.ExchangeNotAvailable)
+    assert exchange.calls == 2
+    assert list(exchange.circuit_breaker_status().keys()) == ['exchange']
+
+
+if __name__ == '__main__':
+    test_circuit_breaker_states()
+    test_exchange_circuit_breaker()
+    test_circuit_breaker_failures()
+    test_circuit_breaker_interrupted_probe()
+    test_circuit_breaker_stops_retries()
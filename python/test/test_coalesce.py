@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.async.base.exchange import Exchange  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class CoalescingExchange(Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(CoalescingExchange, self).describe(), {
+            'id': 'coalescing',
+            'coalesceRequests': True,
+            'api': {
+                'public': {'get': ['ticker']},
+                'private': {'get': ['balance']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': api + '/' + path + '?' + self.urlencode(params), 'method': method, 'body': body, 'headers': headers}
+
+    async def fetch(self, url, method='GET', headers=None, body=None):
+        self.urls_fetched.append(url)
+        await asyncio.sleep(0.01)
+        if self.errors:
+            raise self.errors.pop(0)
+        self.last_response = {'url': url, 'data': [1, 2]}
+        return self.last_response
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        exchange = CoalescingExchange({'asyncio_loop': loop, 'aiohttp_session': object()})
+        exchange.urls_fetched = []
+        exchange.errors = []
+        return loop.run_until_complete(coroutine(loop, exchange))
+    finally:
+        loop.close()
+
+
+def test_coalesce_separate_copies():
+
+    async def main(loop, exchange):
+        responses = await asyncio.gather(*[exchange.publicGetTicker() for i in range(0, 3)])
+        assert exchange.urls_fetched == ['public/ticker?']
+        assert all(response == {'url': 'public/ticker?', 'data': [1, 2]} for response in responses)
+        # every caller that shared the request gets its own copy
+        responses[0]['data'].append(3)
+        assert responses[1]['data'] == [1, 2] and responses[2]['data'] == [1, 2]
+        assert len(set(id(response) for response in responses)) == 3
+        assert not exchange.in_flight
+        # a caller that was alone gets the response itself
+        response = await exchange.publicGetTicker()
+        assert response is exchange.last_response
+        assert len(exchange.urls_fetched) == 2
+
+    run(main)
+
+
+def test_coalesce_distinct_requests():
+
+    async def main(loop, exchange):
+        await asyncio.gather(
+            exchange.publicGetTicker({'symbol': 'BTC'}),
+            exchange.publicGetTicker({'symbol': 'ETH'}),
+            exchange.privateGetBalance(),
+            exchange.privateGetBalance())
+        # other parameters and private apis are not shared
+        assert sorted(exchange.urls_fetched) == ['private/balance?'] * 2 + ['public/ticker?symbol=BTC', 'public/ticker?symbol=ETH']
+
+    run(main)
+
+
+def test_coalesce_error():
+
+    async def main(loop, exchange):
+        exchange.errors = [ccxt.ExchangeNotAvailable('down')]
+        results = await asyncio.gather(*[exchange.publicGetTicker() for i in range(0, 3)], return_exceptions=True)
+        # every caller sees the error of the shared request, which was sent once
+        assert len(exchange.urls_fetched) == 1
+        assert all(isinstance(result, ccxt.ExchangeNotAvailable) for result in results)
+        assert not exchange.in_flight
+        # the failed flight is not reused
+        assert (await exchange.publicGetTicker())['data'] == [1, 2]
+        assert len(exchange.urls_fetched) == 2
+
+    run(main)
+
+
+def test_coalesce_cancellation():
+
+    async def main(loop, exchange):
+        first = asyncio.ensure_future(exchange.publicGetTicker(), loop=loop)
+        second = asyncio.ensure_future(exchange.publicGetTicker(), loop=loop)
+        await asyncio.sleep(0.001)
+        first.cancel()
+        # a cancelled caller does not cancel the request for the others
+        assert (await second)['data'] == [1, 2]
+        assert first.cancelled()
+        assert len(exchange.urls_fetched) == 1
+
+    run(main)
+
+
+if __name__ == '__main__':
+    test_coalesce_separate_copies()
+    test_coalesce_distinct_requests()
+    test_coalesce_error()
+    test_coalesce_cancellation()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import gc
+import hashlib
+import hmac
+import os
+import sys
+import weakref
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def test_hmac_prototypes():
+    exchange = Exchange()
+    for secret in [b'secret', b'another secret', b'k' * 200]:
+        for algorithm in [hashlib.sha256, hashlib.sha384, hashlib.sha512, hashlib.md5]:
+            for request in [b'', b'nonce=1', b'nonce=2']:
+                expected = hmac.new(secret, request, algorithm)
+                assert exchange.hmac(request, secret, algorithm) == expected.hexdigest()
+                assert exchange.hmac(request, secret, algorithm, 'base64') == base64.b64encode(expected.digest())
+                assert exchange.hmac(request, secret, algorithm, 'binary') == expected.digest()
+                # the static Exchange.hmac gives the same results
+                assert Exchange.hmac(request, secret, algorithm) == expected.hexdigest()
+    # the prototypes of an instance are bounded
+    assert 0 < len(exchange.hmac_prototypes) <= exchange.hmacPrototypesSize
+
+
+def test_hmac_prototypes_per_instance():
+    exchange = Exchange()
+    exchange.hmac(b'request', b'secret')
+    assert list(exchange.hmac_prototypes.keys()) == [(b'secret', hashlib.sha256)]
+    other = Exchange()
+    assert other.hmac_prototypes == {}
+    # secrets are not kept anywhere once their exchange is gone
+    assert Exchange.hmac_prototypes is None
+    reference = weakref.ref(exchange)
+    del exchange
+    gc.collect()
+    assert reference() is None
+
+
+def test_hmac_prototypes_size():
+    exchange = Exchange()
+    for i in range(0, exchange.hmacPrototypesSize + 10):
+        exchange.hmac(b'request', str(i).encode('utf-8'))
+    assert len(exchange.hmac_prototypes) <= exchange.hmacPrototypesSize
+
+
+if __name__ == '__main__':
+    test_hmac_prototypes()
+    test_hmac_prototypes_per_instance()
+    test_hmac_prototypes_size()
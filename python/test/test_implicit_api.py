@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def create_classes():
+    # fresh classes per test, implicit methods are defined once per class
+
+    class parent(ccxt.Exchange):
+
+        def describe(self):
+            return self.deep_extend(super(parent, self).describe(), {
+                'id': 'parent',
+                'api': {
+                    'public': {'get': ['ticker', 'trades']},
+                    'v1': {'get': ['book']},
+                },
+            })
+
+        def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
+            return (self.id, api, method, path)
+
+    class child(parent):
+
+        def describe(self):
+            description = super(child, self).describe()
+            # bitfinex2 style, the child replaces the api of its parent
+            description['id'] = 'child'
+            description['api'] = {
+                'public': {'get': ['ticker', 'candles']},
+            }
+            return description
+
+        def public_get_candles(self, params={}):
+            return 'overridden'
+
+    return parent, child
+
+
+def test_implicit_api_class_methods():
+    parent, child = create_classes()
+    exchange = parent()
+    assert exchange.publicGetTicker() == ('parent', 'public', 'GET', 'ticker')
+    assert exchange.v1_get_book() == ('parent', 'v1', 'GET', 'book')
+    assert 'publicGetTicker' not in exchange.__dict__
+    assert parent().public_get_trades.__func__ is exchange.public_get_trades.__func__
+
+
+def test_implicit_api_inheritance():
+    for order in [(0, 1), (1, 0)]:
+        classes = create_classes()
+        instances = [classes[i]() for i in order]
+        exchange, base = (instances[0], instances[1]) if order[0] else (instances[1], instances[0])
+        # the child has its own endpoints only, whichever class was instantiated first
+        assert exchange.publicGetTicker() == ('child', 'public', 'GET', 'ticker')
+        assert exchange.publicGetCandles() == 'overridden'
+        assert exchange.public_get_candles() == 'overridden'
+        for name in ['publicGetTrades', 'public_get_trades', 'v1GetBook', 'v1_get_book']:
+            assert not hasattr(exchange, name), name
+            assert hasattr(base, name), name
+        assert not hasattr(base, 'publicGetCandles')
+        assert set(exchange.api_endpoints) == set([('public', 'GET', 'ticker'), ('public', 'GET', 'candles')])
+
+
+if __name__ == '__main__':
+    test_implicit_api_class_methods()
+    test_implicit_api_inheritance()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.json_backend import json_backends, json_loads  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+url = 'https://example.com'
+
+
+def backends():
+    result = []
+    for backend in sorted(json_backends.keys()):
+        try:
+            json_loads(backend)
+            result.append(backend)
+        except ccxt.NotSupported:
+            pass
+    return result
+
+
+def expect(exchange, response, error):
+    try:
+        exchange.handle_rest_response(response, url)
+    except error:
+        return
+    assert False, exchange.jsonBackend + ' did not raise ' + error.__name__
+
+
+def test_json_backends():
+    for backend in backends() + ['auto']:
+        exchange = ccxt.Exchange({'id': 'mock', 'jsonBackend': backend})
+        for response in ['{"a":[1,"2.5",null]}', b'{"a":[1,"2.5",null]}']:
+            assert exchange.handle_rest_response(response, url) == {'a': [1, '2.5', None]}
+        # non-JSON bodies are classified the same whatever the backend
+        expect(exchange, b'<html>Attention Required! | Cloudflare</html>', ccxt.DDoSProtection)
+        expect(exchange, b'<html>down for maintenance</html>', ccxt.ExchangeNotAvailable)
+        expect(exchange, b'<html>not json</html>', ccxt.ExchangeError)
+
+
+def test_last_http_response():
+    exchange = ccxt.Exchange()
+    exchange.last_http_response = u'{"text":"€"}'.encode('utf-8')
+    assert exchange.last_http_response == u'{"text":"€"}'
+    # the raw body of a response is kept as text, unicode on Python 2
+    exchange.handle_rest_response(u'{"text":"€"}'.encode('utf-8'), url)
+    assert exchange.last_http_response == u'{"text":"€"}'
+    assert type(exchange.last_http_response) is type(u'')
+
+
+def test_decode_response():
+    body = u'{"text":"€"}'.encode('utf-8')
+    assert ccxt.Exchange.decode_response(body) == u'{"text":"€"}'
+    assert ccxt.Exchange.decode_response(u'{"text":"€"}'.encode('cp1251'), 'windows-1251') == u'{"text":"€"}'
+    # an unknown charset or a body that doesn't match it must not raise
+    assert ccxt.Exchange.decode_response(body, 'x-unknown') == u'{"text":"€"}'
+    assert ccxt.Exchange.decode_response(b'{"text":"\xff"}', 'utf-8') == u'{"text":"\ufffd"}'
+
+
+def test_unknown_json_backend():
+    try:
+        ccxt.Exchange({'jsonBackend': 'yaml'}).handle_rest_response('{}', url)
+    except ccxt.NotSupported:
+        return
+    assert False
+
+
+if __name__ == '__main__':
+    test_json_backends()
+    test_last_http_response()
+    test_decode_response()
+    test_unknown_json_backend()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules can't change their class before Python 3.5, lazy_module imports every exchange right away there
+lazy = sys.version_info >= (3, 5)
+
+# ------------------------------------------------------------------------------
+
+
+def if_lazy(*lines):
+    return list(lines) if lazy else []
+
+
+def run(script):
+    # each check runs in a fresh interpreter, so that no exchange is imported yet
+    process = subprocess.Popen([sys.executable, '-c', script], cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+    assert process.returncode == 0, stderr.decode()
+
+
+def test_lazy_module_imports_on_first_access():
+    run('\n'.join([
+        'import sys',
+        'import ccxt',
+    ] + if_lazy(
+        'assert "ccxt.kraken" not in sys.modules',
+        'assert not [name for name in sys.modules if name.startswith("ccxt.") and name[5:] in ccxt.exchanges]',
+    ) + [
+        'kraken = ccxt.kraken',
+        'assert "ccxt.kraken" in sys.modules',
+        'assert isinstance(kraken, type) and kraken().id == "kraken"',
+        'assert ccxt.kraken is kraken',
+    ] + if_lazy(
+        'assert "ccxt.binance" not in sys.modules',
+    )))
+
+
+def test_lazy_module_submodule_import():
+    run('\n'.join([
+        'import ccxt.binance',
+        'import ccxt',
+        'assert isinstance(ccxt.binance, type)',
+        'from ccxt.binance import binance',
+        'assert binance is ccxt.binance',
+    ]))
+
+
+def test_lazy_module_dir_and_all():
+    run('\n'.join([
+        'import sys',
+        'import ccxt',
+        'names = dir(ccxt)',
+        'assert "Exchange" in names and "kraken" in names and "ExchangeError" in names',
+    ] + if_lazy(
+        'assert "ccxt.kraken" not in sys.modules',
+    ) + [
+        'assert set(ccxt.exchanges) <= set(ccxt.__all__)',
+        'assert set(ccxt.__all__) <= set(names)',
+        'from ccxt import Exchange, ExchangeError, kraken',
+        'assert kraken is ccxt.kraken and issubclass(kraken, Exchange)',
+        'try:',
+        '    ccxt.nonexistent',
+        '    assert False',
+        'except AttributeError:',
+        '    pass',
+    ]))
+
+
+if __name__ == '__main__':
+    test_lazy_module_imports_on_first_access()
+    test_lazy_module_submodule_import()
+    test_lazy_module_dir_and_all()
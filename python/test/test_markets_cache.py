@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class MockExchange(ccxt.Exchange):
+
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'urls': {
+                'api': 'https://api.example.com',
+            },
+        })
+
+    def fetch_markets(self):
+        MockExchange.fetches += 1
+        return [{
+            'id': 'foobar',
+            'symbol': 'FOO/BAR',
+            'base': 'FOO',
+            'quote': 'BAR',
+            'info': {'fetch': MockExchange.fetches},
+        }]
+
+
+def test_markets_cache():
+    directory = tempfile.mkdtemp()
+    try:
+        MockExchange.fetches = 0
+        config = {'marketsCacheDirectory': directory}
+
+        # a cold start fetches the markets and persists them
+        markets = MockExchange(config).load_markets()
+        assert MockExchange.fetches == 1
+        assert markets['FOO/BAR']['id'] == 'foobar'
+        assert os.path.isfile(MockExchange(config).markets_cache_path())
+
+        # other instances (and processes) are served from the cache
+        markets = MockExchange(config).load_markets()
+        assert MockExchange.fetches == 1
+        assert markets['FOO/BAR']['info'] == {'fetch': 1}
+
+        # a forced reload goes to the exchange and refreshes the cache
+        MockExchange(config).load_markets(True)
+        assert MockExchange.fetches == 2
+        assert MockExchange(config).load_markets()['FOO/BAR']['info'] == {'fetch': 2}
+
+        # an expired cache is ignored
+        MockExchange(ccxt.Exchange.extend(config, {'marketsCacheTTL': -1})).load_markets()
+        assert MockExchange.fetches == 3
+
+        # no leftovers from atomic writes
+        assert os.listdir(directory) == [os.path.basename(MockExchange(config).markets_cache_path())]
+
+        # a sandbox has markets of its own
+        sandbox = ccxt.Exchange.extend(config, {'urls': {'api': 'https://sandbox.example.com'}})
+        assert MockExchange(sandbox).markets_cache_path() != MockExchange(config).markets_cache_path()
+        assert MockExchange(sandbox).load_markets()['FOO/BAR']['info'] == {'fetch': 4}
+        assert MockExchange(config).load_markets()['FOO/BAR']['info'] == {'fetch': 3}
+        assert MockExchange(sandbox).load_markets()['FOO/BAR']['info'] == {'fetch': 4}
+        assert MockExchange.fetches == 4
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    test_markets_cache()
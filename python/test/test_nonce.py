@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.nonce_manager import NonceManager  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class MockExchange(ccxt.Exchange):
+
+    clock = 1000
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'apiKey': 'key',
+        })
+
+    def nonce(self):
+        return self.clock  # a clock that stands still, or goes backwards
+
+
+def test_monotonic_nonce_threads():
+    exchange = MockExchange({'monotonicNonce': True, 'apiKey': 'threads'})
+    nonces = []
+
+    def worker():
+        for i in range(0, 100):
+            nonces.append(exchange.nonce())
+
+    threads = [threading.Thread(target=worker) for i in range(0, 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(nonces) == list(range(1000, 1400))
+    # the same credentials share the sequence, others have their own
+    assert MockExchange({'monotonicNonce': True, 'apiKey': 'threads'}).nonce() == 1400
+    assert MockExchange({'monotonicNonce': True, 'apiKey': 'other'}).nonce() == 1000
+    assert MockExchange({'apiKey': 'threads'}).nonce() == 1000
+
+    # the sign() of an exchange class takes its nonce from nonce()
+    binance = ccxt.binance({'monotonicNonce': True, 'apiKey': 'signing', 'secret': 'secret'})
+    binance.milliseconds = lambda: 1000
+    urls = [binance.sign('account', 'private')['url'] for i in range(0, 2)]
+    assert ('timestamp=1000&' in urls[0]) and ('timestamp=1001&' in urls[1])
+
+
+def test_persisted_nonce():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'nonces')
+        exchange = MockExchange({'nonceFile': path})
+        assert [exchange.nonce() for i in range(0, 3)] == [1000, 1001, 1002]
+        # a restart continues from the file, even with the clock set back
+        NonceManager.managers = {}
+        exchange = MockExchange({'nonceFile': path})
+        exchange.clock = 500
+        assert exchange.nonce() == 1003
+        exchange.clock = 2000
+        assert exchange.nonce() == 2000
+        assert sorted(os.listdir(directory)) == ['nonces', 'nonces.lock']
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_persisted_nonce_recovery():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'nonces')
+        exchange = MockExchange({'nonceFile': path})
+        assert exchange.nonce() == 1000
+        # a file truncated by a crash or by hand is started over, from the last nonce issued here
+        with open(path, 'w') as f:
+            f.write('{"abc": 10')
+        assert exchange.nonce() == 1001
+        NonceManager.managers = {}
+        exchange = MockExchange({'nonceFile': path})
+        assert exchange.nonce() == 1002
+        with open(path, 'w') as f:
+            f.write('[]')
+        NonceManager.managers = {}
+        assert MockExchange({'nonceFile': path}).nonce() == 1000
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    test_monotonic_nonce_threads()
+    test_persisted_nonce()
+    test_persisted_nonce_recovery()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import math
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ------------------------------------------------------------------------------
+
+minute = 60000
+candles = [[1517443200000 + i * minute, 100.0 + i, 101.5 + i, 99.5 + i, 100.5 + i, 10.0 * i] for i in range(0, 10)]
+
+
+class RawExchange(ccxt.Exchange):
+    pass
+
+
+class KrakenLikeExchange(ccxt.Exchange):
+
+    def parse_ohlcv(self, ohlcv, market=None, timeframe='1m', since=None, limit=None):
+        return [
+            ohlcv[0] * 1000,
+            float(ohlcv[1]),
+            float(ohlcv[2]),
+            float(ohlcv[3]),
+            float(ohlcv[4]),
+            float(ohlcv[6]),
+        ]
+
+
+def kraken_candles():
+    return [[c[0] // 1000, str(c[1]), str(c[2]), str(c[3]), str(c[4]), '0.0', str(c[5]), 5] for c in candles]
+
+
+def columns_to_rows(columns):
+    return [list(row) for row in zip(*[list(columns[field]) for field in ['timestamp', 'open', 'high', 'low', 'close', 'volume']])]
+
+
+def test_ohlcv_array_columns():
+    for exchange, response in [(RawExchange, candles), (KrakenLikeExchange, kraken_candles())]:
+        lists = exchange().parse_ohlcvs(response, None, '1m', candles[2][0], 5)
+        columns = exchange({'ohlcvFormat': 'array'}).parse_ohlcvs(response, None, '1m', candles[2][0], 5)
+        assert columns['timestamp'].typecode in 'ql'
+        assert columns['close'].typecode == 'd'
+        assert columns_to_rows(columns) == lists == candles[2:7]
+    # raw candles with numbers as strings are cast to floats
+    columns = RawExchange({'ohlcvFormat': 'array'}).parse_ohlcvs([[c[0]] + [str(v) for v in c[1:]] for c in candles])
+    assert columns_to_rows(columns) == candles
+
+
+def test_ohlcv_numpy_columns():
+    if numpy is None:
+        try:
+            RawExchange({'ohlcvFormat': 'numpy'}).parse_ohlcvs(candles)
+            assert False
+        except ccxt.NotSupported:
+            return
+    for exchange, response in [(RawExchange, candles), (KrakenLikeExchange, kraken_candles())]:
+        columns = exchange({'ohlcvFormat': 'numpy'}).parse_ohlcvs(response, None, '1m', candles[2][0], 5)
+        assert columns['timestamp'].dtype == numpy.int64
+        assert columns['volume'].dtype == numpy.float64 and columns['volume'].flags['C_CONTIGUOUS']
+        assert columns_to_rows(columns) == candles[2:7]
+    # raw candles with extra fields
+    columns = RawExchange({'ohlcvFormat': 'numpy'}).parse_ohlcvs([c + ['extra'] for c in candles])
+    assert columns_to_rows(columns) == candles
+    assert len(RawExchange({'ohlcvFormat': 'numpy'}).parse_ohlcvs([])['timestamp']) == 0
+
+
+def test_ohlcv_columns_missing_values():
+    formats = ['array'] if numpy is None else ['array', 'numpy']
+    for format in formats:
+        # a None value is nan in the columns, whatever the format
+        columns = RawExchange({'ohlcvFormat': format}).parse_ohlcvs([candles[0], candles[1][0:5] + [None]])
+        assert list(columns['timestamp']) == [candles[0][0], candles[1][0]]
+        assert list(columns['volume'])[0] == candles[0][5]
+        assert math.isnan(list(columns['volume'])[1])
+        # a candle without all six fields is an error
+        for candle in [candles[1][0:5], [None] + candles[1][1:]]:
+            try:
+                RawExchange({'ohlcvFormat': format}).parse_ohlcvs([candles[0], candle])
+                assert False, format
+            except ccxt.ExchangeError as e:
+                assert 'OHLCV candle' in str(e)
+
+
+if __name__ == '__main__':
+    test_ohlcv_array_columns()
+    test_ohlcv_numpy_columns()
+    test_ohlcv_columns_missing_values()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+minute = 60000
+start = 1517443200000  # 2018-02-01T00:00:00Z
+missing = set([start + 25 * minute, start + 26 * minute])  # the exchange has no trades there
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'ohlcvLimit': 10,
+        })
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.calls.append((since, limit))
+        # one candle before since, like exchanges that round since down, and at most 10 candles
+        first = since - minute
+        timestamps = [first + i * minute for i in range(0, min(limit, 10) + 1)]
+        return self.parse_ohlcvs([[t, 1.0, 2.0, 0.5, 1.5, t / minute] for t in timestamps if t not in missing])
+
+
+def test_ohlcv_windows():
+    exchange = MockExchange()
+    assert exchange.parse_timeframe('1m') == 60
+    assert exchange.parse_timeframe('4h') == 14400
+    # since is rounded up to the first candle of the timeframe
+    assert exchange.ohlcv_windows('1m', start + 1, start + 31 * minute) == [
+        (start + minute, 10),
+        (start + 11 * minute, 10),
+        (start + 21 * minute, 10),
+    ]
+    assert exchange.ohlcv_windows('1m', start, start + 25 * minute) == [
+        (start, 10),
+        (start + 10 * minute, 10),
+        (start + 20 * minute, 5),
+    ]
+    assert exchange.ohlcv_windows('1m', start, start) == []
+
+
+def test_fetch_ohlcv_range():
+    exchange = MockExchange()
+    exchange.calls = []
+    result = exchange.fetch_ohlcv_range('BTC/USD', '1m', start, start + 30 * minute)
+    assert len(exchange.calls) == 3
+    timestamps = [ohlcv[0] for ohlcv in result['ohlcv']]
+    assert timestamps == [start + i * minute for i in range(0, 30) if (start + i * minute) not in missing]
+    assert result['gaps'] == [[start + 25 * minute, start + 27 * minute]]
+    # a range the exchange has no candles for at the end
+    exchange.calls = []
+    result = exchange.fetch_ohlcv_range('BTC/USD', '1m', start + 20 * minute, start + 27 * minute)
+    assert result['gaps'] == [[start + 25 * minute, start + 27 * minute]]
+    exchange = MockExchange({'ohlcvFormat': 'array'})
+    exchange.calls = []
+    columns = exchange.fetch_ohlcv_range('BTC/USD', '1m', start, start + 5 * minute)
+    assert list(columns['ohlcv']['timestamp']) == [start + i * minute for i in range(0, 5)]
+
+
+if __name__ == '__main__':
+    test_ohlcv_windows()
+    test_fetch_ohlcv_range()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.ohlcv_store import OhlcvStore  # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ------------------------------------------------------------------------------
+
+minute = 60000
+start = 1517443200000  # 2018-02-01T00:00:00Z
+now = start + 100 * minute + 30000  # in the middle of a candle
+missing = set([start + 50 * minute, start + 51 * minute])  # no trades
+
+
+def candle(timestamp):
+    return [timestamp, 1.0, 2.0, 0.5, 1.5, float(timestamp // minute % 1000)]
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'ohlcvLimit': 20,
+        })
+
+    def milliseconds(self):
+        return now
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        self.calls.append((since, limit))
+        timestamps = [since + i * minute for i in range(0, limit)]
+        # including the candle in progress, which must not be stored
+        return [candle(t) for t in timestamps if (t not in missing) and (t <= now)]
+
+
+def test_ohlcv_store():
+    directory = tempfile.mkdtemp()
+    try:
+        store = OhlcvStore(directory)
+        assert store.gaps('mock', 'BTC/USD', '1m', start, start + 10 * minute, minute) == [[start, start + 10 * minute]]
+        assert store.write('mock', 'BTC/USD', '1m', [candle(start + i * minute) for i in range(0, 10) if i not in [3, 4, 7]]) == 7
+        assert store.gaps('mock', 'BTC/USD', '1m', start, start + 12 * minute, minute) == [
+            [start + 3 * minute, start + 5 * minute],
+            [start + 7 * minute, start + 8 * minute],
+            [start + 10 * minute, start + 12 * minute],
+        ]
+        # range lookups and an older candle merged in
+        view = store.view('mock', 'BTC/USD', '1m', start + 2 * minute, start + 6 * minute)
+        assert len(view) == 2 * 48  # two records, start + 2 and start + 5 minutes
+        assert store.write('mock', 'BTC/USD', '1m', [candle(start + 3 * minute), candle(start + 9 * minute)]) == 1
+        assert [ohlcv[0] for ohlcv in store.ohlcvs('mock', 'BTC/USD', '1m', start + 2 * minute, start + 6 * minute)] == [start + 2 * minute, start + 3 * minute, start + 5 * minute]
+        assert store.ohlcvs('mock', 'BTC/USD', '1m', start + 2 * minute, start + 3 * minute) == [candle(start + 2 * minute)]
+        # the view taken before the merge still reads the old file
+        assert len(view) == 2 * 48
+        # another store on the same directory, like another process, sees the candles
+        assert len(OhlcvStore(directory).ohlcvs('mock', 'BTC/USD', '1m')) == 8
+        if numpy is not None:
+            array = store.numpy('mock', 'BTC/USD', '1m', start, start + 4 * minute)
+            assert array['timestamp'].tolist() == [start, start + minute, start + 2 * minute, start + 3 * minute]
+            assert array['volume'].dtype == numpy.float64
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_ohlcv_store_sync():
+    directory = tempfile.mkdtemp()
+    try:
+        store = OhlcvStore(directory)
+        exchange = MockExchange()
+        exchange.calls = []
+        gaps = store.sync(exchange, 'BTC/USD', '1m', start)
+        # the exchange has no candles for the gap, the candle in progress is left out
+        assert gaps == [[start + 50 * minute, start + 52 * minute]]
+        assert len(exchange.calls) == 5
+        ohlcvs = store.ohlcvs('mock', 'BTC/USD', '1m')
+        assert len(ohlcvs) == 98
+        assert ohlcvs[-1][0] == start + 99 * minute
+        # the gap the exchange has no candles for is not fetched again, only the new candles are
+        exchange.calls = []
+        assert store.sync(exchange, 'BTC/USD', '1m') == gaps
+        assert exchange.calls == []
+        assert OhlcvStore(directory).unchecked('mock', 'BTC/USD', '1m', gaps) == []
+        global now
+        now += 3 * minute
+        try:
+            assert store.sync(exchange, 'BTC/USD', '1m') == gaps
+            assert exchange.calls == [(start + 100 * minute, 3)]
+        finally:
+            now -= 3 * minute
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_ohlcv_store_unchecked():
+    directory = tempfile.mkdtemp()
+    try:
+        store = OhlcvStore(directory)
+        assert store.unchecked('mock', 'BTC/USD', '1m', [[start, start + 10 * minute]]) == [[start, start + 10 * minute]]
+        ohlcv_file = store.file('mock', 'BTC/USD', '1m')
+        ohlcv_file.check([[start + 2 * minute, start + 4 * minute], [start + 8 * minute, start + 12 * minute]])
+        ohlcv_file.check([[start + 3 * minute, start + 5 * minute]])
+        assert store.unchecked('mock', 'BTC/USD', '1m', [[start, start + 10 * minute], [start + 11 * minute, start + 12 * minute], [None, start]]) == [
+            [start, start + 2 * minute],
+            [start + 5 * minute, start + 8 * minute],
+            [None, start],
+        ]
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    test_ohlcv_store()
+    test_ohlcv_store_sync()
+    test_ohlcv_store_unchecked()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ------------------------------------------------------------------------------
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'orderBookFormat': 'numpy',
+        })
+
+    def fetch_order_book(self, symbol, params={}):
+        return self.parse_order_book({
+            'bids': [['7000.5', '1.5'], ['7001.0', '0.25'], ['7000.5', '0.5']],
+            'asks': [['7002', 1], ['7003.25', '2']],
+        })
+
+
+class DictExchange(MockExchange):
+
+    def parse_bid_ask(self, bidask, price_key=0, amount_key=1):
+        return [float(bidask[price_key]), float(bidask[amount_key]) * 2]
+
+
+def test_order_book_array():
+    if numpy is None:
+        try:
+            MockExchange().fetch_order_book('BTC/USD')
+            assert False
+        except ccxt.NotSupported:
+            return
+    exchange = MockExchange()
+    orderbook = exchange.fetch_order_book('BTC/USD')
+    bids = orderbook['bids']
+    assert bids.dtype == numpy.float64 and bids.shape == (3, 2) and bids.flags['C_CONTIGUOUS']
+    assert bids.tolist() == [[7000.5, 1.5], [7001.0, 0.25], [7000.5, 0.5]]
+    assert orderbook['asks'].tolist() == [[7002.0, 1.0], [7003.25, 2.0]]
+    # the same result as the list format
+    lists = MockExchange({'orderBookFormat': 'list'}).fetch_order_book('BTC/USD')
+    assert lists['bids'] == bids.tolist()
+    l2 = exchange.fetch_l2_order_book('BTC/USD')
+    assert l2['bids'].tolist() == [[7001.0, 0.25], [7000.5, 2.0]]
+    assert l2['asks'].tolist() == [[7002.0, 1.0], [7003.25, 2.0]]
+    assert exchange.sort_by(bids, 0, True).tolist() == [[7001.0, 0.25], [7000.5, 1.5], [7000.5, 0.5]]
+    # keys into dicts and overridden parsers
+    levels = exchange.parse_order_book({'bids': [{'p': '1.5', 'q': '2'}], 'asks': []}, None, 'bids', 'asks', 'p', 'q')
+    assert levels['bids'].tolist() == [[1.5, 2.0]]
+    assert levels['asks'].shape == (0, 2)
+    assert DictExchange().fetch_order_book('BTC/USD')['asks'].tolist() == [[7002.0, 2.0], [7003.25, 4.0]]
+    # levels with more fields than price and amount
+    levels = exchange.parse_order_book({'bids': [['1', '2', 'id1'], ['3', '4', 'id2']]}, None, 'bids', 'asks', 0, 1)
+    assert levels['bids'].tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+
+if __name__ == '__main__':
+    test_order_book_array()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.throttle import throttle  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'rateLimit': 10,
+            'enableRateLimit': True,
+            'tokenBuckets': {
+                'private': {},
+                'orders': {'refillRate': 1.0 / 100},
+            },
+            'api': {
+                'public': {
+                    'get': {
+                        'ticker': 1,
+                        'depth': 5,
+                    },
+                },
+                'private': {
+                    'get': ['account'],
+                    'post': {
+                        'order': {'bucket': 'orders'},
+                    },
+                },
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        self.signed_params = params
+        return {'url': path, 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        return {}
+
+
+def test_throttle_cost():
+    bucket = throttle({'refillRate': 1.0 / 10})
+    start = time.time()
+    bucket()
+    bucket(5)
+    bucket()
+    # the heavy call leaves the bucket 4 tokens in debt, the next one waits 50 ms
+    assert 0.045 < time.time() - start < 0.090
+
+
+def test_throttle_threads():
+    bucket = throttle({'refillRate': 1.0 / 10})
+    start = time.time()
+    threads = [threading.Thread(target=bucket) for i in range(0, 10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # the first call is immediate, the other nine are spaced by 10 ms
+    assert 0.085 < time.time() - start < 0.140
+
+
+def test_endpoint_costs_and_buckets():
+    exchange = MockExchange()
+    assert exchange.endpoint_throttle('depth', 'public', 'GET') == (exchange.throttle, 5)
+    assert exchange.endpoint_throttle('ticker', 'public', 'GET') == (exchange.throttle, 1)
+    assert exchange.endpoint_throttle('account', 'private', 'GET') == (exchange.throttles['private'], None)
+    assert exchange.endpoint_throttle('order', 'private', 'POST') == (exchange.throttles['orders'], None)
+    assert exchange.throttles['orders'].cfg['refillRate'] == 1.0 / 100
+    assert exchange.throttles['private'].cfg['refillRate'] == 1.0 / 10
+    start = time.time()
+    exchange.publicGetTicker()
+    exchange.publicGetDepth()
+    # independent buckets do not wait for each other
+    exchange.privateGetAccount()
+    exchange.privatePostOrder()
+    assert time.time() - start < 0.030
+    exchange.publicGetTicker()
+    assert 0.045 < time.time() - start < 0.090
+
+
+def test_rate_limit_changed_after_construction():
+    exchange = MockExchange()
+    exchange.rateLimit = 20
+    # the buckets that derive from the rateLimit follow it, explicit rates stay
+    assert exchange.endpoint_throttle('ticker', 'public', 'GET') == (exchange.throttle, 1)
+    assert exchange.effective_rate_limit() == 20
+    assert exchange.throttles['private'].cfg['refillRate'] == 1.0 / 20
+    assert exchange.throttles['orders'].cfg['refillRate'] == 1.0 / 100
+    assert exchange.tokenBucket['maxRefillRate'] == 2.0 / 20
+    start = time.time()
+    exchange.publicGetTicker()
+    exchange.publicGetTicker()
+    exchange.publicGetTicker()
+    assert 0.035 < time.time() - start < 0.070
+    # a rate set in the tokenBucket is not derived from the rateLimit
+    exchange = MockExchange({'tokenBucket': {'refillRate': 1.0 / 50}})
+    exchange.rateLimit = 20
+    exchange.endpoint_throttle('ticker', 'public', 'GET')
+    assert exchange.effective_rate_limit() == 50
+    assert exchange.tokenBucket['maxRefillRate'] == 2.0 / 20
+
+
+def test_token_bucket_keys():
+    exchange = MockExchange({'tokenBucket': {'key': 'account'}, 'tokenBuckets': {'own': {'key': 'own'}}})
+    assert exchange.throttle.cfg['key'] == 'account:default'
+    assert exchange.throttles['private'].cfg['key'] == 'account:private'
+    assert exchange.throttles['own'].cfg['key'] == 'own'
+    assert MockExchange().throttles['orders'].cfg['key'] == 'mock:orders'
+
+
+def test_request_priority():
+    exchange = MockExchange()
+    assert exchange.request_priority('ticker', 'public', 'GET') == 'public'
+    assert exchange.request_priority('account', 'private', 'GET') == 'private'
+    assert exchange.request_priority('order', 'private', 'POST') == 'create'
+    assert exchange.request_priority('order', 'private', 'DELETE') == 'cancel'
+    exchange = MockExchange({
+        'throttlePriorities': {
+            'publicGetTicker': 'private',
+            'private': 'create',
+        },
+    })
+    assert exchange.request_priority('ticker', 'public', 'GET') == 'private'
+    assert exchange.request_priority('account', 'private', 'GET') == 'create'
+    # an explicit param wins, unified methods pass it through to the implicit call
+    assert exchange.request_priority('account', 'private', 'GET', {'throttlePriority': 'cancel'}) == 'cancel'
+    # and it is never sent to the exchange
+    exchange.privateGetAccount({'throttlePriority': 'cancel', 'currency': 'BTC'})
+    assert exchange.signed_params == {'currency': 'BTC'}
+
+
+class OverloadedExchange(MockExchange):
+
+    status = 200
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        if self.status is None:
+            # a connection error, the last response is from an earlier request
+            raise ccxt.ExchangeNotAvailable('connection refused')
+        self.last_http_status_code = self.status
+        self.last_response_headers = {'Retry-After': '0.1'} if self.status == 429 else {}
+        try:
+            self.handle_rest_errors(None, self.status, '', url, method)
+        except ccxt.BaseError as e:
+            self.annotate_error(e, self.status, self.last_response_headers)
+            raise
+        return {}
+
+
+def test_adaptive_rate_limit():
+    exchange = OverloadedExchange({'adaptiveRateLimit': True})
+    assert exchange.effective_rate_limit() == 10
+    for i in range(0, 10):
+        exchange.publicGetTicker()
+    # additive increase, up to twice the configured rate
+    assert 8.0 < exchange.effective_rate_limit() < 9.0
+    exchange.status = 429
+    try:
+        exchange.publicGetTicker()
+    except ccxt.DDoSProtection:
+        pass
+    assert 16.0 < exchange.effective_rate_limit() < 18.0
+    # the Retry-After header holds the next call back
+    exchange.status = 200
+    start = time.time()
+    exchange.publicGetTicker()
+    assert time.time() - start > 0.09
+    # one cut per burst of rejections, and none for errors other than 429 and 503
+    exchange.throttle.cfg['lastDecrease'] = 0
+    exchange.status = 404
+    try:
+        exchange.publicGetTicker()
+    except ccxt.ExchangeNotAvailable:
+        pass
+    assert 16.0 < exchange.effective_rate_limit() < 18.0
+    exchange.status = 503
+    try:
+        exchange.publicGetTicker()
+    except ccxt.ExchangeNotAvailable:
+        pass
+    assert 32.0 < exchange.effective_rate_limit() < 36.0
+    # the back-off follows the error, not the status of an earlier response
+    exchange.throttle.cfg['lastDecrease'] = 0
+    exchange.status = None
+    try:
+        exchange.publicGetTicker()
+    except ccxt.ExchangeNotAvailable:
+        pass
+    assert exchange.last_http_status_code == 503
+    assert 32.0 < exchange.effective_rate_limit() < 36.0
+
+
+if __name__ == '__main__':
+    test_throttle_cost()
+    test_throttle_threads()
+    test_endpoint_costs_and_buckets()
+    test_rate_limit_changed_after_construction()
+    test_token_bucket_keys()
+    test_request_priority()
+    test_adaptive_rate_limit()
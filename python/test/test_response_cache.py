@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.response_cache import ResponseCache  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'urls': {'api': 'https://api.mock.com'},
+            'api': {
+                'public': {'get': ['exchangeInfo', 'ticker/bookTicker']},
+                'private': {'get': ['account']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': self.urls['api'] + '/' + path + '?' + self.urlencode(params), 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        self.fetches.append(url)
+        return self.handle_rest_response(b'{"url":"' + url.encode() + b'","n":' + str(len(self.fetches)).encode() + b'}', url, method, headers, body)
+
+
+def create(config={}):
+    exchange = MockExchange(ccxt.Exchange.extend({
+        'cacheResponses': True,
+        'responseCacheTTL': {
+            'publicGetExchangeInfo': 3600000,
+            'publicGetTickerBookTicker': 50,
+        },
+    }, config))
+    exchange.fetches = []
+    return exchange
+
+
+def test_response_cache_ttl():
+    exchange = create()
+    first = exchange.publicGetExchangeInfo()
+    first['n'] = 'changed by the caller'
+    assert exchange.publicGetExchangeInfo() == {'url': 'https://api.mock.com/exchangeInfo?', 'n': 1}
+    # different parameters make a different request
+    exchange.publicGetExchangeInfo({'symbol': 'FOO'})
+    assert len(exchange.fetches) == 2
+    exchange.public_get_ticker_bookticker()
+    exchange.publicGetTickerBookTicker()
+    assert len(exchange.fetches) == 3
+    time.sleep(0.06)
+    exchange.publicGetTickerBookTicker()
+    assert len(exchange.fetches) == 4
+    assert exchange.response_cache.stats == {'hits': 2, 'misses': 4, 'expired': 1, 'evicted': 0}
+    assert exchange.last_http_response == '{"url":"https://api.mock.com/ticker/bookTicker?","n":4}'
+
+
+def test_response_cache_private_and_disabled():
+    exchange = create()
+    exchange.privateGetAccount()
+    exchange.privateGetAccount()
+    assert len(exchange.fetches) == 2
+    exchange = create({'cacheResponses': False})
+    exchange.publicGetExchangeInfo()
+    exchange.publicGetExchangeInfo()
+    assert len(exchange.fetches) == 2
+
+
+def test_response_cache_lru():
+    cache = ResponseCache(10)
+    cache.set('a', b'1234', 1000)
+    cache.set('b', b'1234', 1000)
+    cache.get('a')
+    cache.set('c', b'1234', 1000)
+    # b was the least recently used
+    assert list(cache.entries.keys()) == ['a', 'c']
+    assert cache.size == 8
+    cache.set('d', b'12345678901', 1000)
+    assert 'd' not in cache.entries
+
+
+if __name__ == '__main__':
+    test_response_cache_ttl()
+    test_response_cache_private_and_disabled()
+    test_response_cache_lru()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class FlakyExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(FlakyExchange, self).describe(), {
+            'id': 'flaky',
+            'retryPolicy': {
+                'maxRetries': 3,
+                'baseDelay': 1,
+                'maxDelay': 5,
+                'idempotent': ['privatePostBalance'],
+            },
+            'api': {
+                'public': {'get': ['ticker']},
+                'private': {
+                    'get': {
+                        'orders': None,
+                        'order/create': 1,  # places an order over a signed GET
+                        'order/status': {'cost': 1, 'idempotent': True},
+                    },
+                    'post': ['order', 'balance'],
+                },
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        self.nonces.append(self.nonce())
+        return {'url': path, 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'attempts': len(self.nonces)}
+
+
+def create(errors, config={}):
+    exchange = FlakyExchange(config)
+    exchange.errors = errors
+    exchange.nonces = []
+    return exchange
+
+
+def expect(exchange, method, error):
+    try:
+        getattr(exchange, method)()
+    except error:
+        return
+    assert False, method + ' did not raise ' + error.__name__
+
+
+def test_retry_idempotent():
+    exchange = create([ccxt.RequestTimeout('timeout'), ccxt.ExchangeNotAvailable('maintenance')])
+    assert exchange.publicGetTicker() == {'attempts': 3}
+    # the policy bounds the number of attempts
+    exchange = create([ccxt.RequestTimeout('timeout')] * 4)
+    expect(exchange, 'publicGetTicker', ccxt.RequestTimeout)
+    assert len(exchange.nonces) == 4
+    # errors from the exchange itself are not retried
+    exchange = create([ccxt.InsufficientFunds('no money')])
+    expect(exchange, 'publicGetTicker', ccxt.InsufficientFunds)
+    assert len(exchange.nonces) == 1
+
+
+def test_retry_non_idempotent():
+    # a timed out order may have gone through
+    exchange = create([ccxt.RequestTimeout('timeout')])
+    expect(exchange, 'privatePostOrder', ccxt.RequestTimeout)
+    assert len(exchange.nonces) == 1
+    exchange = create([ccxt.RequestTimeout('timeout')])
+    expect(exchange, 'privateGetOrderCreate', ccxt.RequestTimeout)
+    assert len(exchange.nonces) == 1
+    # signed calls are not repeated whatever their method or error
+    for method in ['privatePostOrder', 'privateGetOrderCreate', 'privateGetOrders']:
+        for error in [ccxt.InvalidNonce('nonce too small'), ccxt.DDoSProtection('429'), ccxt.ExchangeNotAvailable('maintenance')]:
+            exchange = create([error])
+            expect(exchange, method, type(error))
+            assert len(exchange.nonces) == 1
+    # unless their endpoint is declared safe to repeat, in the retry policy or in the api
+    for method in ['privatePostBalance', 'privateGetOrderStatus']:
+        exchange = create([ccxt.RequestTimeout('timeout'), ccxt.InvalidNonce('nonce too small'), ccxt.DDoSProtection('429')])
+        assert getattr(exchange, method)() == {'attempts': 4}
+
+
+def test_retry_deadline():
+    exchange = create([ccxt.RequestTimeout('timeout')] * 3, {'retryPolicy': {'deadline': 0}})
+    expect(exchange, 'publicGetTicker', ccxt.RequestTimeout)
+    assert len(exchange.nonces) == 1
+    exchange = create([ccxt.RequestTimeout('timeout')], {'retryPolicy': {'maxRetries': 0}})
+    expect(exchange, 'publicGetTicker', ccxt.RequestTimeout)
+
+
+if __name__ == '__main__':
+    test_retry_idempotent()
+    test_retry_non_idempotent()
+    test_retry_deadline()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import gc
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.async.base.exchange import Exchange  # noqa: E402
+from ccxt.async.base.session_manager import SessionManager  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class FakeConnector(object):
+
+    def __init__(self, session):
+        self.session = session
+
+    def close(self):
+        self.session.closed = True
+
+
+class FakeSession(object):
+
+    def __init__(self):
+        self.closed = False
+        self.connector = FakeConnector(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSessionManager(SessionManager):
+
+    def create_session(self):
+        self.stats['created'] += 1
+        return FakeSession()
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine(loop))
+    finally:
+        loop.close()
+
+
+def test_session_manager_acquire_release():
+
+    async def main(loop):
+        manager = FakeSessionManager(loop)
+        session = manager.acquire()
+        assert manager.acquire() is session
+        assert manager.references == 2
+        await manager.release()
+        assert not session.closed
+        # closing the last reference closes the session
+        await manager.release()
+        assert session.closed
+        assert manager.session is None
+        # a later acquire opens a new session
+        assert manager.acquire() is not session
+        assert manager.stats['created'] == 2
+        await manager.release()
+
+    run(main)
+
+
+def test_session_manager_shared():
+
+    async def main(loop):
+        manager = SessionManager.shared(loop)
+        assert SessionManager.shared(loop) is manager
+        manager.create_session = lambda: FakeSession()
+        session = manager.acquire()
+        await manager.release()
+        assert session.closed
+        # the default manager of the loop is dropped with its last session
+        assert loop not in SessionManager.managers
+        assert SessionManager.shared(loop) is not manager
+        del SessionManager.managers[loop]
+
+    run(main)
+
+
+def test_session_manager_exchanges():
+
+    async def main(loop):
+        manager = FakeSessionManager(loop)
+        first = Exchange({'asyncio_loop': loop, 'session_manager': manager})
+        second = Exchange({'asyncio_loop': loop, 'session_manager': manager})
+        session = first.aiohttp_session
+        assert second.aiohttp_session is session
+        assert manager.references == 2
+        await first.close()
+        # closing twice must not release the session of the other exchange
+        await first.close()
+        assert not session.closed
+        assert manager.references == 1
+        async with second:
+            pass
+        assert session.closed
+        assert manager.references == 0
+
+    run(main)
+
+
+def test_session_manager_garbage_collected_exchanges():
+
+    async def main(loop):
+        manager = FakeSessionManager(loop)
+        first = Exchange({'asyncio_loop': loop, 'session_manager': manager})
+        second = Exchange({'asyncio_loop': loop, 'session_manager': manager})
+        session = first.aiohttp_session
+        # an exchange that is dropped without close() releases its reference
+        del first
+        gc.collect()
+        assert manager.references == 1
+        assert not session.closed
+        del second
+        gc.collect()
+        assert manager.references == 0
+        assert session.closed
+        assert manager.session is None
+
+    run(main)
+
+
+if __name__ == '__main__':
+    test_session_manager_acquire_release()
+    test_session_manager_shared()
+    test_session_manager_exchanges()
+    test_session_manager_garbage_collected_exchanges()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class described(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(described, self).describe(), {
+            'id': 'described',
+            'countries': ['JP', 'US'],
+            'urls': {
+                'api': 'https://api.example.com',
+                'doc': ['https://docs.example.com'],
+            },
+            'api': {
+                'public': {'get': ['ticker', 'trades']},
+            },
+        })
+
+
+def expect_readonly(change):
+    try:
+        change()
+    except (TypeError, AttributeError):
+        return
+    assert False, 'the shared description was changed'
+
+
+def test_shared_description_is_frozen():
+    exchange = described()
+    description = exchange.describe_class()
+    assert description is described().describe_class()
+    assert description['urls']['doc'] == ('https://docs.example.com',)
+    assert description['api']['public']['get'] == ('ticker', 'trades')
+    expect_readonly(lambda: description['urls'].update({'api': 'https://other.example.com'}))
+    expect_readonly(lambda: description['urls']['doc'].append('https://other.example.com'))
+    expect_readonly(lambda: exchange.urls['doc'].append('https://other.example.com'))
+    expect_readonly(lambda: exchange.api['public']['get'].append('orderbook'))
+    assert described().api['public']['get'] == ('ticker', 'trades')
+
+
+def test_shared_description_private_copies():
+    exchange = described()
+    # top-level values are private copies
+    exchange.urls['api'] = 'https://sandbox.example.com'
+    exchange.countries.append('GB')
+    other = described()
+    assert other.urls['api'] == 'https://api.example.com'
+    assert other.countries == ['JP', 'US']
+    # constructor settings are merged over the shared description
+    configured = described({'urls': {'api': 'https://sandbox.example.com'}})
+    assert configured.urls['api'] == 'https://sandbox.example.com'
+    assert configured.urls['doc'] == ('https://docs.example.com',)
+    # frozen values still copy and serialize like the originals
+    assert copy.deepcopy(exchange.describe_class()['api']) == {'public': {'get': ('ticker', 'trades')}}
+    assert json.loads(json.dumps(other.urls)) == {'api': 'https://api.example.com', 'doc': ['https://docs.example.com']}
+
+
+if __name__ == '__main__':
+    test_shared_description_is_frozen()
+    test_shared_description_private_copies()
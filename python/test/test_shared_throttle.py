@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.throttle import shared_throttle  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+interval = 20  # milliseconds
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'rateLimit': interval,
+            'enableRateLimit': True,
+            'api': {
+                'public': {'get': ['ticker']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': path, 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        return time.time()
+
+
+def worker(path, num_calls, timestamps):
+    exchange = MockExchange({'rateLimitFile': path})
+    for i in range(0, num_calls):
+        timestamps.put(exchange.publicGetTicker())
+
+
+def test_shared_throttle_processes():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'buckets')
+        timestamps = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=worker, args=(path, 10, timestamps)) for i in range(0, 4)]
+        for process in workers:
+            process.start()
+        result = sorted([timestamps.get(timeout=10) for i in range(0, 40)])
+        for process in workers:
+            process.join()
+        # all processes together stay within one request per interval
+        window = 10
+        for i in range(0, len(result) - window):
+            assert (result[i + window] - result[i]) * 1000 > (window - 1) * interval
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_shared_throttle_keys():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'buckets')
+        first = shared_throttle({'file': path, 'key': 'first', 'refillRate': 1.0 / 50})
+        second = shared_throttle({'file': path, 'key': 'second', 'refillRate': 1.0 / 50})
+        same = shared_throttle({'file': path, 'key': 'first', 'refillRate': 1.0 / 50})
+        start = time.time()
+        first()
+        second()
+        assert time.time() - start < 0.020
+        same()
+        assert time.time() - start > 0.045
+        # a pause applies to every user of the key
+        first.pause(100)
+        start = time.time()
+        same()
+        assert time.time() - start > 0.095
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    test_shared_throttle_processes()
+    test_shared_throttle_keys()
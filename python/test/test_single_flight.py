@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class MockExchange(ccxt.Exchange):
+
+    fetches = 0
+    fail = False
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+        })
+
+    def fetch_markets(self):
+        MockExchange.fetches += 1
+        time.sleep(0.05)
+        if MockExchange.fail:
+            raise ccxt.ExchangeNotAvailable('mock is down')
+        return [{
+            'id': 'foobar',
+            'symbol': 'FOO/BAR',
+            'base': 'FOO',
+            'quote': 'BAR',
+        }]
+
+
+def load_concurrently(exchange, num_threads=10):
+    results = []
+
+    def load():
+        try:
+            results.append(exchange.load_markets())
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=load) for i in range(0, num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_load_markets():
+    MockExchange.fetches = 0
+    MockExchange.fail = False
+    exchange = MockExchange()
+    results = load_concurrently(exchange)
+    assert MockExchange.fetches == 1
+    assert all(result is results[0] for result in results)
+    assert results[0]['FOO/BAR']['id'] == 'foobar'
+    assert not exchange.in_flight
+
+
+def test_single_flight_error():
+    MockExchange.fetches = 0
+    MockExchange.fail = True
+    exchange = MockExchange()
+    results = load_concurrently(exchange)
+    # every caller sees the error of the one shared attempt
+    assert MockExchange.fetches == 1
+    assert all(isinstance(result, ccxt.ExchangeNotAvailable) for result in results)
+    # and the next call tries again
+    MockExchange.fail = False
+    assert exchange.load_markets()['FOO/BAR']['id'] == 'foobar'
+    assert MockExchange.fetches == 2
+
+
+if __name__ == '__main__':
+    test_single_flight_load_markets()
+    test_single_flight_error()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+interval = 10  # milliseconds
+num_threads = 4
+
+
+class Barrier(object):
+    """A reusable start gate for a number of threads, as threading.Barrier which Python 2 does not have"""
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.waiting = 0
+        self.generation = 0
+        self.condition = threading.Condition()
+
+    def wait(self, timeout):
+        with self.condition:
+            generation = self.generation
+            self.waiting += 1
+            if self.waiting == self.parties:
+                # the last thread opens the gate for all of them and resets it for the next round
+                self.waiting = 0
+                self.generation += 1
+                self.condition.notify_all()
+                return
+            deadline = time.time() + timeout
+            while generation == self.generation:
+                remaining = deadline - time.time()
+                assert remaining > 0, 'the other threads did not reach the barrier'
+                self.condition.wait(remaining)
+
+
+class MockExchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(MockExchange, self).describe(), {
+            'id': 'mock',
+            'rateLimit': interval,
+            'enableRateLimit': True,
+            'threadSafe': True,
+            'api': {
+                'public': {'get': ['ticker/{symbol}']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': self.implode_params(path, params), 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None):
+        timestamp = time.time()
+        self.last_http_status_code = 200
+        response = self.handle_rest_response(json.dumps({'url': url}).encode('utf-8'), url, method)
+        # every thread has stored its response before any of them reads the last one back
+        self.barrier.wait(5)
+        return timestamp if response == self.last_json_response else None
+
+    def fetch_markets(self):
+        self.markets_loaded = getattr(self, 'markets_loaded', 0) + 1
+        return [{'id': 'BTCUSD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD'}]
+
+
+def create(config={}):
+    exchange = MockExchange(config)
+    exchange.barrier = Barrier(num_threads)
+    return exchange
+
+
+def run_threads(target, num_threads):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(0, num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_thread_safe_calls():
+    exchange = create()
+    timestamps = []
+    urls = []
+
+    def worker(i):
+        for j in range(0, 5):
+            timestamps.append(exchange.publicGetTickerSymbol({'symbol': str(i) + '-' + str(j)}))
+            urls.append(exchange.last_json_response['url'] == 'ticker/' + str(i) + '-' + str(j))
+
+    run_threads(worker, num_threads)
+    assert len(timestamps) == 20
+    # every thread saw its own response and the threads together kept to the rate limit
+    assert None not in timestamps
+    assert all(urls)
+    timestamps.sort()
+    # 20 calls take at least 19 intervals, less a few ms the scheduler may add to either end
+    assert (timestamps[-1] - timestamps[0]) * 1000 > 19 * interval - 10
+
+
+def test_thread_safe_load_markets():
+    exchange = create()
+    markets = []
+    start = Barrier(8)
+
+    def worker(i):
+        start.wait(5)
+        markets.append(exchange.load_markets())
+
+    run_threads(worker, 8)
+    # threads either join the load in flight or find the markets it has set
+    assert exchange.markets_loaded == 1
+    assert all(result is markets[0] for result in markets)
+
+
+def test_response_state_shared_by_default():
+    exchange = create({'threadSafe': False})
+    results = []
+    run_threads(lambda i: results.append(exchange.publicGetTickerSymbol({'symbol': str(i)})), num_threads)
+    # without threadSafe the threads overwrite each other's last response
+    assert results.count(None) >= num_threads - 1
+    exchange.barrier = Barrier(1)
+    exchange.publicGetTickerSymbol({'symbol': 'BTCUSD'})
+    assert exchange.last_json_response == {'url': 'ticker/BTCUSD'}
+
+
+if __name__ == '__main__':
+    test_thread_safe_calls()
+    test_thread_safe_load_markets()
+    test_response_state_shared_by_default()
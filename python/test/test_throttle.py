@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.async.base.throttle import throttle  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine(loop))
+    finally:
+        loop.close()
+
+
+def test_throttle_fifo_and_rate():
+
+    async def main(loop):
+        bucket = throttle({'loop': loop, 'refillRate': 1.0 / 20, 'capacity': 1.0})
+        queued = []
+        order = []
+
+        async def call(i):
+            queued.append(i)
+            await bucket()
+            order.append((i, loop.time()))
+
+        start = loop.time()
+        # gather does not start its coroutines in argument order on every python version
+        await asyncio.gather(*[asyncio.ensure_future(call(i), loop=loop) for i in range(0, 10)])
+        assert [i for i, timestamp in order] == queued
+        # first call is immediate, the other nine are spaced by 20 ms
+        assert order[0][1] - start < 0.010
+        assert 0.175 < order[-1][1] - start < 0.260
+
+    run(main)
+
+
+def test_throttle_cost():
+
+    async def main(loop):
+        bucket = throttle({'loop': loop, 'refillRate': 1.0 / 10, 'capacity': 1.0})
+        start = loop.time()
+        await bucket()
+        await bucket(5)
+        await bucket()
+        # the heavy call leaves the bucket 4 tokens in debt, the next one waits 50 ms
+        assert 0.045 < loop.time() - start < 0.090
+
+    run(main)
+
+
+def test_throttle_cancellation():
+
+    async def main(loop):
+        bucket = throttle({'loop': loop, 'refillRate': 1.0 / 50, 'capacity': 1.0})
+        await bucket()
+        waiter = asyncio.ensure_future(bucket(), loop=loop)
+        follower = asyncio.ensure_future(bucket(), loop=loop)
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        start = loop.time()
+        await follower
+        # the follower takes the slot of the cancelled waiter
+        assert loop.time() - start < 0.060
+        assert not any(bucket.queues.values())
+
+    run(main)
+
+
+def test_throttle_lanes():
+
+    async def main(loop):
+        bucket = throttle({'loop': loop, 'refillRate': 1.0 / 10, 'capacity': 1.0, 'starvationTimeout': 45})
+        order = []
+
+        async def call(name, lane):
+            await bucket(1, lane)
+            order.append(name)
+
+        await bucket()
+        backlog = [asyncio.ensure_future(call('public' + str(i), 'public'), loop=loop) for i in range(0, 8)]
+        await asyncio.sleep(0.001)
+        assert bucket.depths()['public'] == 8
+        urgent = [
+            asyncio.ensure_future(call('private', 'private'), loop=loop),
+            asyncio.ensure_future(call('cancel', 'cancel'), loop=loop),
+        ]
+        await asyncio.gather(*(backlog + urgent))
+        # the cancel jumps the backlog first, then the private read
+        assert order == ['cancel', 'private'] + ['public' + str(i) for i in range(0, 8)]
+        assert bucket.stats['public']['granted'] == 9
+        assert bucket.stats['public']['maxDepth'] == 8
+
+        # a flood of cancels does not starve the public lane beyond the starvationTimeout
+        del order[:]
+        public = asyncio.ensure_future(call('public', 'public'), loop=loop)
+        await asyncio.sleep(0.001)
+        cancels = [asyncio.ensure_future(call('cancel' + str(i), 'cancel'), loop=loop) for i in range(0, 10)]
+        await asyncio.gather(public, *cancels)
+        assert 3 <= order.index('public') <= 6
+
+    run(main)
+
+
+if __name__ == '__main__':
+    test_throttle_fifo_and_rate()
+    test_throttle_cost()
+    test_throttle_cancellation()
+    test_throttle_lanes()